@@ -0,0 +1 @@
+"""Backend building blocks for the AkshRail Streamlit app."""
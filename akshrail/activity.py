@@ -0,0 +1,194 @@
+"""Append-only, columnar log of document activity for the Dashboard.
+
+Every row of the metastore's `status_history` (an upload or a status change)
+becomes one event. Events are stored in Arrow IPC segment files of exactly
+`segment_rows` events each, sorted by event time. Segments are never
+rewritten and are read through memory maps. `index.json` is the time index:
+the row count and first/last event time of each segment, so a time-window
+query skips segments outside the window without opening them.
+
+Pages are ordered by event time, newest first, not by arrival. Bulk imports
+backdate their events, so arrival order says little. Within each segment a
+window is a zero-copy slice found by binary search on the sorted time
+column. The page is picked across segments by rank: a binary search for the
+time of its oldest row, then a sort of only the rows at or after that time.
+Only the page's rows are gathered, and only the requested columns.
+
+Events newer than the last full segment (the tail) are kept in memory and
+re-read from the metastore at open, so a segment is only written once it is
+full. Segment boundaries therefore depend only on the event sequence.
+`page` syncs with the metastore only when its data version has changed.
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+
+FORMAT = 2  # segments sorted by (at, seq)
+SCHEMA = pa.schema([
+    ("seq", pa.int64()),
+    ("at", pa.timestamp("us")),
+    ("ordinal", pa.int64()),
+    ("doc_id", pa.string()),
+    ("title", pa.string()),
+    ("doc_type", pa.string()),
+    ("action", pa.string()),
+    ("status", pa.string()),
+])
+
+
+class ActivityLog:
+    def __init__(self, path, metastore, segment_rows: int = 65_536):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.metastore = metastore
+        self.segment_rows = segment_rows
+        self._lock = threading.Lock()
+        self._segments = self._load_index()  # [{"rows", "first_seq", "last_seq", "min_at", "max_at"}], oldest first
+        self._mapped = {}  # segment number -> memory-mapped Table
+        self._tail = {name: [] for name in SCHEMA.names}
+        self._tail_table = None
+        self.last_seq = self._segments[-1]["last_seq"] if self._segments else 0
+        self._synced_version = None  # metastore data version at the last sync
+
+    def __len__(self):
+        return sum(s["rows"] for s in self._segments) + len(self._tail["seq"])
+
+    # ---------- writing ----------
+    def sync(self, batch: int = 10_000) -> int:
+        """Append events the metastore has recorded since the last sync; returns how many."""
+        added = 0
+        with self._lock:
+            while True:
+                rows = self.metastore.activity_since(self.last_seq, batch)
+                for seq, changed_at, ordinal, doc_id, title, doc_type, old, new in rows:
+                    event = (seq, datetime.fromisoformat(changed_at), ordinal, doc_id, title, doc_type,
+                             "Uploaded" if old is None else "Status changed", new)
+                    for name, value in zip(SCHEMA.names, event):
+                        self._tail[name].append(value)
+                    if len(self._tail["seq"]) == self.segment_rows:
+                        self._write_segment()
+                if rows:
+                    self.last_seq = rows[-1][0]
+                    self._tail_table = None
+                    added += len(rows)
+                if len(rows) < batch:
+                    return added
+
+    # ---------- queries ----------
+    def page(self, start: datetime = None, end: datetime = None, offset: int = 0, limit: int = 25,
+             columns=None) -> tuple:
+        """(Table of events newest first, events in the window) for events with start <= at < end.
+
+        Only `columns` are read (default all); the Table holds rows [offset, offset + limit) of the window.
+        """
+        version = self.metastore.version
+        if version != self._synced_version:
+            self._synced_version = version  # before syncing, so a commit during the sync is seen next time
+            self.sync()
+        columns = list(columns or SCHEMA.names)
+        lo = np.datetime64(start, "us").astype(np.int64) if start else None
+        hi = np.datetime64(end, "us").astype(np.int64) if end else None
+        with self._lock:
+            parts = [self._tail_view()]
+            segments = list(enumerate(self._segments))
+        parts += [self._segment(number) for number, meta in segments
+                  if (lo is None or meta["max_at"] >= lo) and (hi is None or meta["min_at"] < hi)]
+        # Each part's window is a contiguous run of its time-sorted rows.
+        windows = []
+        for table in parts:
+            at = table.column("at").to_numpy().astype(np.int64)
+            i0 = int(np.searchsorted(at, lo)) if lo is not None else 0
+            i1 = int(np.searchsorted(at, hi)) if hi is not None else at.size
+            if i0 < i1:
+                windows.append((table.slice(i0, i1 - i0), at[i0:i1]))  # zero-copy
+        total = sum(at.size for _, at in windows)
+        m = min(offset + limit, total)
+        schema = pa.schema([SCHEMA.field(c) for c in columns])
+        if offset >= m:
+            return schema.empty_table(), total
+
+        # Oldest time on the page: the largest t with at least m events at or after it.
+        def at_or_after(t):
+            return sum(at.size - int(np.searchsorted(at, t)) for _, at in windows)
+
+        low, high = min(int(at[0]) for _, at in windows), max(int(at[-1]) for _, at in windows)
+        while low < high:
+            mid = (low + high + 1) // 2
+            if at_or_after(mid) >= m:
+                low = mid
+            else:
+                high = mid - 1
+        # Rows at or after that time, newest first by (at, seq); the page is a slice of them.
+        cand_part, cand_row, cand_at, cand_seq = [], [], [], []
+        for p, (table, at) in enumerate(windows):
+            first = int(np.searchsorted(at, low))
+            rows = np.arange(first, at.size)
+            cand_part.append(np.full(rows.size, p))
+            cand_row.append(rows)
+            cand_at.append(at[first:])
+            cand_seq.append(table.column("seq").slice(first).to_numpy())
+        cand_part, cand_row = np.concatenate(cand_part), np.concatenate(cand_row)
+        order = np.lexsort((-np.concatenate(cand_seq), -np.concatenate(cand_at)))[offset:m]
+        pieces, positions = [], []
+        for p, (table, _) in enumerate(windows):
+            mine = np.flatnonzero(cand_part[order] == p)
+            if mine.size:
+                pieces.append(table.select(columns).take(cand_row[order[mine]]))
+                positions.append(mine)
+        page = pa.concat_tables(pieces)
+        return page.take(np.argsort(np.concatenate(positions))), total
+
+    # ---------- internals ----------
+    def _tail_view(self) -> pa.Table:
+        if self._tail_table is None:
+            self._tail_table = _sorted(pa.table(self._tail, schema=SCHEMA))
+        return self._tail_table
+
+    def _segment(self, number: int) -> pa.Table:
+        table = self._mapped.get(number)
+        if table is None:
+            with pa.memory_map(str(self._segment_path(number))) as source:
+                table = self._mapped[number] = pa.ipc.open_file(source).read_all()
+        return table
+
+    def _segment_path(self, number: int) -> Path:
+        return self.path / f"segment-{number:06d}.arrow"
+
+    def _write_segment(self):
+        table = _sorted(pa.table(self._tail, schema=SCHEMA))
+        number = len(self._segments)
+        path = self._segment_path(number)
+        tmp = path.with_suffix(".arrow.tmp")
+        with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, SCHEMA) as writer:
+            writer.write_table(table)  # uncompressed, so readers can memory-map it
+        os.replace(tmp, path)
+        at = table.column("at").to_numpy().astype(np.int64)
+        self._segments.append({"rows": table.num_rows, "first_seq": self._tail["seq"][0],
+                               "last_seq": self._tail["seq"][-1], "min_at": int(at.min()), "max_at": int(at.max())})
+        (self.path / "index.json.tmp").write_text(json.dumps({"format": FORMAT, "segment_rows": self.segment_rows,
+                                                              "segments": self._segments}))
+        os.replace(self.path / "index.json.tmp", self.path / "index.json")
+        self._tail = {name: [] for name in SCHEMA.names}
+
+    def _load_index(self) -> list:
+        try:
+            index = json.loads((self.path / "index.json").read_text())
+        except (OSError, ValueError):
+            return []
+        if index.get("format") != FORMAT or index["segment_rows"] != self.segment_rows:
+            return []  # written in another layout; start over from the metastore
+        segments = index["segments"]
+        # Trust only the prefix whose files exist.
+        for number in range(len(segments)):
+            if not self._segment_path(number).exists():
+                return segments[:number]
+        return segments
+
+
+def _sorted(table: pa.Table) -> pa.Table:
+    return table.sort_by([("at", "ascending"), ("seq", "ascending")])
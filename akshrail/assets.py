@@ -0,0 +1,223 @@
+"""Lottie animation loader with memory, disk and offline-bundle caching.
+
+Lookups go memory -> disk cache -> network, with the pre-built bundle as the
+last resort. The disk cache is content-addressed: payloads are stored once
+under their SHA-256 and an index maps each URL to its current hash together
+with the ETag/Last-Modified validators used for conditional revalidation.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+from akshrail import config
+
+log = logging.getLogger(__name__)
+
+LOTTIE_URLS = {
+    "home": "https://lottie.host/17eb65e5-3375-4c07-a50d-d1235b62b32f/lQ2Jz8wO9D.json",  # Welcome
+    "summary": "https://assets7.lottiefiles.com/packages/lf20_u4yrau.json",  # AI Animation
+    "alert": "https://assets9.lottiefiles.com/packages/lf20_tutvdkg0.json",  # Alert/Notification
+    "upload": "https://assets2.lottiefiles.com/packages/lf20_jbr3byh0.json",  # Upload
+    "search": "https://assets1.lottiefiles.com/packages/lf20_x17yudbs.json",  # Search
+    "analytics": "https://assets1.lottiefiles.com/packages/lf20_mhlvj87g.json",  # Analytics
+    "about": "https://assets4.lottiefiles.com/packages/lf20_tpgx4e3e.json",  # About/Info
+}
+
+DEFAULT_TTL = 24 * 3600
+NEGATIVE_TTL = 60  # don't retry a failing URL on every rerun
+DEFAULT_TIMEOUT = (3.05, 8)  # (connect, read) seconds
+
+_NOT_MODIFIED = object()
+
+
+def _atomic_write(path: Path, data: bytes):
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class _ObjectStore:
+    """Content-addressed JSON payloads plus a URL -> hash manifest."""
+
+    def __init__(self, root: Path, manifest_name: str):
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.manifest_path = self.root / manifest_name
+        self._lock = threading.Lock()
+        self._manifest = self._read_manifest()
+
+    def _read_manifest(self) -> dict:
+        try:
+            return json.loads(self.manifest_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def entry(self, url: str):
+        return self._manifest.get(url)
+
+    def read(self, digest: str):
+        try:
+            return json.loads((self.objects / f"{digest}.json").read_bytes())
+        except (OSError, ValueError):
+            return None
+
+    def put(self, url: str, body: bytes, **meta) -> str:
+        digest = hashlib.sha256(body).hexdigest()
+        self.objects.mkdir(parents=True, exist_ok=True)
+        obj = self.objects / f"{digest}.json"
+        if not obj.exists():
+            _atomic_write(obj, body)
+        self.update(url, sha256=digest, **meta)
+        return digest
+
+    def update(self, url: str, **meta):
+        with self._lock:
+            entry = dict(self._manifest.get(url, {}))
+            entry.update(meta)
+            self._manifest[url] = entry
+            self.root.mkdir(parents=True, exist_ok=True)
+            _atomic_write(self.manifest_path, json.dumps(self._manifest, indent=1).encode())
+
+
+class LottieLoader:
+    """Thread-safe loader shared by every session in the process."""
+
+    def __init__(self, cache_dir=None, bundle_dir=None, ttl: float = DEFAULT_TTL,
+                 timeout=DEFAULT_TIMEOUT, offline: bool = None, max_workers: int = 4):
+        self.ttl = ttl
+        self.timeout = timeout
+        self.offline = config.OFFLINE if offline is None else offline
+        self.disk = _ObjectStore(cache_dir or config.DATA_DIR / "lottie_cache", "index.json")
+        bundle_dir = Path(bundle_dir or config.ASSET_BUNDLE_DIR)
+        self.bundle = _ObjectStore(bundle_dir, "manifest.json") if bundle_dir.is_dir() else None
+        self._memory = {}  # url -> (payload, expires_at); payload None caches a failure
+        self._url_locks = {}
+        self._locks_guard = threading.Lock()
+        self._local = threading.local()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="lottie")
+
+    # ---------- public API ----------
+    def get(self, url: str):
+        """Return the parsed animation for `url`, or None if unavailable."""
+        hit = self._memory.get(url)
+        if hit is not None and time.time() < hit[1]:
+            return hit[0]
+        with self._lock_for(url):
+            hit = self._memory.get(url)
+            if hit is not None and time.time() < hit[1]:
+                return hit[0]
+            payload = self._load(url)
+            self._memory[url] = (payload, time.time() + (self.ttl if payload is not None else NEGATIVE_TTL))
+            return payload
+
+    def prefetch(self, urls):
+        """Warm the caches in the background without blocking the caller."""
+        if self.offline:
+            return []
+        return [self._pool.submit(self.get, url) for url in urls]
+
+    # ---------- internals ----------
+    def _lock_for(self, url: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._url_locks.setdefault(url, threading.Lock())
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _load(self, url: str):
+        entry = self.disk.entry(url)
+        cached = self.disk.read(entry["sha256"]) if entry else None
+        if cached is not None and (self.offline or time.time() - entry.get("fetched_at", 0) < self.ttl):
+            return cached
+        if not self.offline:
+            fetched = self._fetch(url, entry if cached is not None else None)
+            if fetched is not None:
+                return cached if fetched is _NOT_MODIFIED else fetched
+        # Network unavailable or failed: serve stale data rather than nothing.
+        if cached is not None:
+            return cached
+        return self._from_bundle(url)
+
+    def _fetch(self, url: str, entry):
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        try:
+            r = self._session().get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as exc:
+            log.warning("Lottie fetch failed for %s: %s", url, exc)
+            return None
+        if r.status_code == 304 and entry:
+            self.disk.update(url, fetched_at=time.time())
+            return _NOT_MODIFIED
+        if r.status_code != 200:
+            return None
+        try:
+            payload = r.json()
+        except ValueError:
+            return None
+        self.disk.put(url, r.content, etag=r.headers.get("ETag"),
+                      last_modified=r.headers.get("Last-Modified"), fetched_at=time.time())
+        return payload
+
+    def _from_bundle(self, url: str):
+        if self.bundle is None:
+            return None
+        entry = self.bundle.entry(url)
+        return self.bundle.read(entry["sha256"]) if entry else None
+
+
+def build_bundle(out_dir=None, urls=None, timeout=DEFAULT_TIMEOUT) -> dict:
+    """Download every animation in parallel into an offline bundle directory."""
+    out = _ObjectStore(Path(out_dir or config.ASSET_BUNDLE_DIR), "manifest.json")
+    urls = list(urls or LOTTIE_URLS.values())
+
+    def fetch(url):
+        try:
+            r = requests.get(url, timeout=timeout)
+            r.raise_for_status()
+            r.json()  # refuse to bundle anything that is not valid JSON
+        except (requests.RequestException, ValueError) as exc:
+            return url, None, exc
+        return url, r.content, None
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(urls) or 1) as pool:
+        for url, body, exc in pool.map(fetch, urls):
+            if body is None:
+                results[url] = f"failed: {exc}"
+                continue
+            results[url] = out.put(url, body, fetched_at=time.time())
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the offline Lottie bundle.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build-bundle", help="download all animations into a local bundle")
+    build.add_argument("--out", default=None, help=f"bundle directory (default: {config.ASSET_BUNDLE_DIR})")
+    args = parser.parse_args(argv)
+
+    results = build_bundle(args.out)
+    for url, status in results.items():
+        print(f"{status[:12] if not status.startswith('failed') else status}  {url}")
+    return 0 if all(not s.startswith("failed") for s in results.values()) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
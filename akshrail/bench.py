@@ -0,0 +1,376 @@
+"""Headless performance benchmark for the Streamlit app.
+
+    python -m akshrail.bench --docs 2000 --runs 20 --budget dashboard=400 --budgets budgets.json
+
+Builds a synthetic corpus in a scratch data directory, then drives
+AkshRailDemo.py with Streamlit's AppTest (no browser, no server) with all
+network access stubbed out. Every scenario is measured once cold (Streamlit
+caches cleared, so stores are reopened) and `--runs` times warm, recording
+rerun latency, peak Python memory and the number of rendered elements.
+AppTest cannot drive `st.file_uploader`, so uploads are measured on the
+service call the Upload form makes.
+
+`--imports` instead reports cold import costs: the app shell and each page
+module measured in fresh interpreters, and the time a fresh process takes
+to render the landing page.
+
+Budgets are warm p95 latencies in milliseconds per scenario name ("*" for
+all others); the exit status is 1 when any budget is exceeded or a
+scenario raises.
+"""
+import argparse
+import atexit
+import contextlib
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+APP = Path(__file__).resolve().parent.parent / "AkshRailDemo.py"
+
+_WORDS = ("metro line track bogie inspection safety station budget invoice payment drawing signal depot "
+          "audit maintenance contract vendor minutes board approval policy evacuation tender rolling stock "
+          "overhead traction ticketing escalator platform timetable report quarterly").split()
+
+
+@dataclass
+class Scenario:
+    name: str
+    setup: object  # fn(at): bring the app to the state before the measured interaction
+    action: object  # fn(at, i): the interaction whose rerun is timed; `i` counts repetitions
+
+
+@dataclass
+class Result:
+    name: str
+    cold_ms: float = 0.0
+    warm_ms: list = field(default_factory=list)
+    peak_mb: float = 0.0
+    elements: int = 0
+    error: str = None
+
+    @property
+    def p50(self) -> float:
+        return float(np.percentile(self.warm_ms, 50)) if self.warm_ms else 0.0
+
+    @property
+    def p95(self) -> float:
+        return float(np.percentile(self.warm_ms, 95)) if self.warm_ms else 0.0
+
+
+# ---------- scenarios ----------
+def _goto(page):
+    def setup(at):
+        at.sidebar.radio[0].set_value(page)
+        at.run()
+    return setup
+
+
+def _select_page(page):
+    # The cold run navigates to the page; warm runs rerun it as any widget interaction would.
+    return lambda at, i: at.sidebar.radio[0].set_value(page)
+
+
+def _submit_search(query):
+    def action(at, i):
+        at.text_input[0].input(query)
+        at.button[0].click()
+    return action
+
+
+def _search_then(query):
+    def setup(at):
+        _goto("Search")(at)
+        _submit_search(query)(at, 0)
+        at.run()
+    return setup
+
+
+def _toggle_filter(at, i):
+    type_filter = at.multiselect[0]
+    type_filter.set_value([type_filter.options[0].split(" (")[0]] if i % 2 == 0 else [])
+
+
+def _turn_page(at, i):
+    label = "Next →" if i % 2 == 0 else "← Previous"
+    next(b for b in at.button if b.label == label).click()
+
+
+def default_scenarios(query: str = "metro safety inspection") -> list:
+    pages = ["Home", "Dashboard", "Upload", "Search", "Analytics", "About"]
+    scenarios = [Scenario(page.lower(), _goto("Home" if page != "Home" else "About"), _select_page(page))
+                 for page in pages]
+    scenarios += [
+        Scenario("search.submit", _goto("Search"), _submit_search(query)),
+        Scenario("search.filter", _search_then(query), _toggle_filter),
+        Scenario("search.page", _search_then(query), _turn_page),
+    ]
+    return scenarios
+
+
+# ---------- measurement ----------
+def run_scenario(scenario: Scenario, runs: int, timeout: float = 120) -> Result:
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    result = Result(scenario.name)
+    at = AppTest.from_file(str(APP), default_timeout=timeout)
+    try:
+        at.run()
+        scenario.setup(at)
+        st.cache_data.clear()
+        st.cache_resource.clear()
+        result.cold_ms = _timed_run(at, scenario, 0)
+        for i in range(1, runs + 1):
+            result.warm_ms.append(_timed_run(at, scenario, i))
+        scenario.action(at, runs + 1)
+        tracemalloc.start()
+        try:
+            at.run()
+            result.peak_mb = tracemalloc.get_traced_memory()[1] / 2**20
+        finally:
+            tracemalloc.stop()
+        result.elements = _count_elements(at.main) + _count_elements(at.sidebar)
+    except Exception as exc:  # one broken scenario should not hide the others
+        result.error = f"{type(exc).__name__}: {exc}"
+    return result
+
+
+def _timed_run(at, scenario: Scenario, i: int) -> float:
+    scenario.action(at, i)
+    start = time.perf_counter()
+    at.run()
+    elapsed = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return elapsed
+
+
+def _count_elements(node) -> int:
+    children = getattr(node, "children", None)
+    if not children:
+        return 1
+    return sum(_count_elements(c) for c in children.values())
+
+
+def run_upload(services, runs: int, words: int, seed: int = 0) -> tuple:
+    """Time `Services.submit_upload` (what the Upload form calls) and the full pipeline behind it."""
+    rng = random.Random(seed)
+    submit, processed = Result("upload.submit"), Result("upload.process")
+    for i in range(runs + 1):
+        data = _document_text(rng, words).encode()
+        start = time.perf_counter()
+        job_id = services.submit_upload(data, f"bench_{i}.txt", f"Bench upload {i}", "Report")
+        submitted = time.perf_counter()
+        while not services.pipeline.job(job_id).finished:
+            time.sleep(0.002)
+        done = time.perf_counter()
+        if i == 0:
+            submit.cold_ms, processed.cold_ms = (submitted - start) * 1000, (done - start) * 1000
+        else:
+            submit.warm_ms.append((submitted - start) * 1000)
+            processed.warm_ms.append((done - start) * 1000)
+    return submit, processed
+
+
+# ---------- corpus ----------
+def _document_text(rng: random.Random, words: int) -> str:
+    sentences = []
+    for _ in range(max(1, words // 12)):
+        sentences.append(" ".join(rng.choices(_WORDS, k=12)).capitalize() + ".")
+    return " ".join(sentences)
+
+
+def build_corpus(services, n_docs: int, words: int = 120, seed: int = 0):
+    """Ingest `n_docs` synthetic text documents and move some along the review workflow."""
+    from akshrail.documents import DOCUMENT_TYPES, STATUSES
+
+    rng = random.Random(seed)
+    in_flight, ordinals = [], []
+
+    def harvest():
+        # Collect finished jobs before the pipeline forgets them (it keeps only the latest few hundred).
+        for job_id in list(in_flight):
+            job = services.pipeline.job(job_id)
+            if job is None or job.finished:
+                in_flight.remove(job_id)
+                if job is not None and job.result:
+                    ordinals.append(job.result["ordinal"])
+
+    for i in range(n_docs):
+        while not services.pipeline.has_room():
+            harvest()
+            time.sleep(0.005)
+        title = " ".join(rng.choices(_WORDS, k=4)).title()
+        in_flight.append(services.submit_upload(_document_text(rng, words).encode(), f"doc_{i}.txt", title,
+                                                rng.choice(DOCUMENT_TYPES)))
+    while in_flight:
+        harvest()
+        time.sleep(0.005)
+    for ordinal in rng.sample(ordinals, len(ordinals) // 3):
+        services.set_status(ordinal, rng.choice(STATUSES))
+
+
+@contextlib.contextmanager
+def no_network():
+    """Make any HTTP request fail immediately, the way an offline host would."""
+    import requests
+
+    def refuse(*args, **kwargs):
+        raise requests.ConnectionError("network access is disabled in the benchmark")
+
+    original = requests.Session.request
+    requests.Session.request = refuse
+    try:
+        yield
+    finally:
+        requests.Session.request = original
+
+
+# ---------- import costs ----------
+_SHELL = "akshrail.views.common"
+
+
+def _fresh_python(code: str, repeat: int) -> float:
+    """Median of a float printed by `code`, each run in a new interpreter."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(APP.parent), os.environ.get("PYTHONPATH")])))
+    samples = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", code], env=env, cwd=APP.parent, check=True,
+                             capture_output=True, text=True).stdout
+        samples.append(float(out.strip().splitlines()[-1]))
+    return float(np.median(samples))
+
+
+def measure_imports(repeat: int = 3) -> dict:
+    """Cold import ms of the app shell and, on top of it, of each page module."""
+    from akshrail.views import PAGES
+
+    timer = "import time, streamlit{pre}; t = time.perf_counter(); import {mod}; print((time.perf_counter() - t) * 1000)"
+    report = {"shell": _fresh_python(timer.format(pre="", mod=_SHELL), repeat)}
+    for page, module in PAGES.items():
+        report[f"page {page}"] = _fresh_python(timer.format(pre=f", {_SHELL}", mod=module), repeat)
+    return report
+
+
+def measure_first_paint(repeat: int = 3) -> float:
+    """ms from interpreter start (streamlit already imported) to the landing page fully rendered."""
+    code = (f"import time, streamlit; t = time.perf_counter()\n"
+            f"from streamlit.testing.v1 import AppTest\n"
+            f"at = AppTest.from_file({str(APP)!r}, default_timeout=120); at.run()\n"
+            f"assert not at.exception, at.exception\n"
+            f"print((time.perf_counter() - t) * 1000)")
+    return _fresh_python(code, repeat)
+
+
+# ---------- budgets and reporting ----------
+def load_budgets(path=None, overrides=()) -> dict:
+    budgets = json.loads(Path(path).read_text()) if path else {}
+    for item in overrides:
+        name, _, ms = item.partition("=")
+        budgets[name] = float(ms)
+    return budgets
+
+
+def check_budgets(results, budgets: dict) -> list:
+    """Names of scenarios that failed or whose warm p95 is over budget."""
+    failed = []
+    for r in results:
+        budget = budgets.get(r.name, budgets.get("*"))
+        if r.error or (budget is not None and r.p95 > budget):
+            failed.append(r.name)
+    return failed
+
+
+def format_table(results, budgets: dict) -> str:
+    lines = [f"{'scenario':<16}{'cold ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'budget':>9}{'peak MB':>10}"
+             f"{'elements':>10}  status"]
+    for r in results:
+        budget = budgets.get(r.name, budgets.get("*"))
+        if r.error:
+            status = f"ERROR {r.error}"
+        elif budget is not None and r.p95 > budget:
+            status = "OVER BUDGET"
+        else:
+            status = "ok"
+        lines.append(f"{r.name:<16}{r.cold_ms:>10.1f}{r.p50:>10.1f}{r.p95:>10.1f}"
+                     f"{'-' if budget is None else f'{budget:.0f}':>9}{r.peak_mb:>10.1f}{r.elements:>10}  {status}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every page of the app headlessly.")
+    parser.add_argument("--docs", type=int, default=500, help="synthetic documents to ingest first")
+    parser.add_argument("--words", type=int, default=120, help="words per synthetic document")
+    parser.add_argument("--runs", type=int, default=10, help="warm reruns per scenario")
+    parser.add_argument("--only", nargs="*", help="scenario names to run (default: all)")
+    parser.add_argument("--budgets", help="JSON file of {scenario: p95 ms}; '*' applies to the rest")
+    parser.add_argument("--budget", action="append", default=[], metavar="NAME=MS", help="override one budget")
+    parser.add_argument("--data-dir", help="reuse this data directory instead of a fresh one")
+    parser.add_argument("--out", help="write the raw results here as JSON")
+    parser.add_argument("--imports", action="store_true", help="report cold import costs and exit")
+    args = parser.parse_args(argv)
+    budgets = load_budgets(args.budgets, args.budget)
+
+    data_dir = args.data_dir
+    if data_dir is None:
+        data_dir = tempfile.mkdtemp(prefix="akshrail-bench-")
+        # Registered first so it runs last, after the app's own Services have closed.
+        atexit.register(shutil.rmtree, data_dir, ignore_errors=True)
+    data_dir = Path(data_dir)
+    # Must be set before the app (and akshrail.config) is imported.
+    os.environ["AKSHRAIL_DATA_DIR"] = str(data_dir)
+    os.environ["AKSHRAIL_OFFLINE"] = "1"
+    sys.path.insert(0, str(APP.parent))
+
+    if args.imports:
+        report = measure_imports()
+        report["first paint (Home)"] = measure_first_paint()
+        for name, ms in report.items():
+            print(f"{name:<24}{ms:>10.1f} ms")
+        if args.out:
+            Path(args.out).write_text(json.dumps(report, indent=2))
+        return 0
+
+    from akshrail.services import Services
+
+    with no_network():
+        services = Services(data_dir, compute="thread", workers=4)
+        if len(services.metastore) < args.docs:
+            start = time.perf_counter()
+            build_corpus(services, args.docs - len(services.metastore), args.words)
+            print(f"Ingested {args.docs} documents in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+        services.close()
+
+        results = []
+        for scenario in default_scenarios():
+            if args.only and scenario.name not in args.only:
+                continue
+            print(f"running {scenario.name}...", file=sys.stderr)
+            results.append(run_scenario(scenario, args.runs))
+        if not args.only or {"upload.submit", "upload.process"} & set(args.only):
+            services = Services(data_dir, compute="thread")
+            results.extend(run_upload(services, args.runs, args.words))
+            services.close()
+
+    print(format_table(results, budgets))
+    if args.out:
+        rows = [asdict(r) | {"p50_ms": r.p50, "p95_ms": r.p95} for r in results]
+        Path(args.out).write_text(json.dumps({"docs": args.docs, "runs": args.runs, "results": rows}, indent=2))
+    failed = check_budgets(results, budgets)
+    if failed:
+        print(f"FAILED: {', '.join(failed)}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,50 @@
+"""Packed bitmaps over document ordinals.
+
+A bitmap is a uint8 array with bit `o % 8` of byte `o // 8` set when ordinal
+`o` is a member. Bitmaps of different lengths combine as if the shorter one
+were padded with zeros.
+"""
+import numpy as np
+
+
+def empty(n_bits: int = 0) -> np.ndarray:
+    return np.zeros((n_bits + 7) // 8, dtype=np.uint8)
+
+
+def from_ordinals(ordinals, n_bits: int = 0) -> np.ndarray:
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    n_bits = max(n_bits, int(ordinals.max()) + 1 if ordinals.size else 0)
+    bits = empty(n_bits)
+    np.bitwise_or.at(bits, ordinals >> 3, (1 << (ordinals & 7)).astype(np.uint8))
+    return bits
+
+
+def to_ordinals(bits: np.ndarray) -> np.ndarray:
+    return np.flatnonzero(np.unpackbits(bits, bitorder="little"))
+
+
+def test(bits: np.ndarray, ordinals) -> np.ndarray:
+    """Boolean membership of each ordinal."""
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    inside = ordinals < bits.size * 8
+    out = np.zeros(ordinals.shape, dtype=bool)
+    o = ordinals[inside]
+    out[inside] = (bits[o >> 3] >> (o & 7).astype(np.uint8)) & 1 == 1
+    return out
+
+
+def intersect(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    n = min(a.size, b.size)
+    return a[:n] & b[:n]
+
+
+def union(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    if a.size < b.size:
+        a, b = b, a
+    out = a.copy()
+    out[:b.size] |= b
+    return out
+
+
+def count(bits: np.ndarray) -> int:
+    return int(np.bitwise_count(bits).sum())
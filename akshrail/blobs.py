@@ -0,0 +1,119 @@
+"""Content-addressed blob store for uploaded files.
+
+Uploads are streamed through a fixed-size buffer: each chunk is hashed and
+written to a temporary file, which is fsynced and renamed to
+`objects/<sha[:2]>/<sha>` once the digest is known. Identical uploads map to
+the same object, so the second copy is simply discarded. Memory use per
+upload is one chunk, whatever the file size. Reads can be ranged, so a
+preview takes the head of a file without loading the rest.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class BlobStore:
+    def __init__(self, path, chunk_size: int = CHUNK_SIZE):
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        self._objects = self.path / "objects"
+        self._tmp = self.path / "tmp"
+        self._objects.mkdir(parents=True, exist_ok=True)
+        self._tmp.mkdir(parents=True, exist_ok=True)
+        for stale in self._tmp.iterdir():  # left behind by a crash mid-write
+            stale.unlink(missing_ok=True)
+
+    # ---------- writes ----------
+    def put(self, source) -> tuple:
+        """Store `source` (bytes or a binary file object); returns (sha256 hex, size)."""
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp = tempfile.mkstemp(dir=self._tmp)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in self._chunks(source):
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+            sha = digest.hexdigest()
+            target = self.object_path(sha)
+            if target.exists():
+                os.unlink(tmp)  # already stored
+                return sha, size
+            target.parent.mkdir(exist_ok=True)
+            os.replace(tmp, target)
+            _fsync_dir(target.parent)
+            return sha, size
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    # ---------- reads ----------
+    def object_path(self, sha: str) -> Path:
+        if len(sha) != 64 or not all(c in "0123456789abcdef" for c in sha):
+            raise ValueError(f"not a sha256 digest: {sha!r}")
+        return self._objects / sha[:2] / sha
+
+    def open(self, sha: str):
+        return open(self.object_path(sha), "rb")
+
+    def read_range(self, sha: str, start: int = 0, length: int = None) -> bytes:
+        """Bytes [start, start + length) of a blob, e.g. the head of a file for a preview."""
+        return b"".join(self.iter_range(sha, start, length))
+
+    def iter_range(self, sha: str, start: int = 0, length: int = None):
+        """Like `read_range` but yields chunks, for serving large ranges."""
+        remaining = float("inf") if length is None else length
+        with self.open(sha) as f:
+            f.seek(start)
+            while remaining > 0:
+                chunk = f.read(int(min(self.chunk_size, remaining)))
+                if not chunk:
+                    return
+                remaining -= len(chunk)
+                yield chunk
+
+    # ---------- internals ----------
+    def _chunks(self, source):
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            view = memoryview(source)
+            for start in range(0, len(view), self.chunk_size):
+                yield view[start:start + self.chunk_size]  # slices of a memoryview do not copy
+            return
+        if hasattr(source, "readinto"):
+            buf = bytearray(self.chunk_size)
+            view = memoryview(buf)
+            while True:
+                n = source.readinto(buf)
+                if not n:
+                    return
+                yield view[:n]
+        else:
+            while True:
+                chunk = source.read(self.chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+
+def _fsync_dir(path: Path):
+    """Make a rename durable; not supported (or needed) on every platform."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        log.debug("fsync of %s not supported", path)
+    finally:
+        os.close(fd)
@@ -0,0 +1,230 @@
+"""Bulk import of an existing document archive.
+
+    python -m akshrail.bulkimport /mnt/archive --workers 8 --doc-type Report
+
+Walks the directory tree, keeps the file types the Upload page accepts and
+pushes every file through the same ingest pipeline as an upload, with the
+CPU-bound stages in a process pool of `--workers` processes. Documents are
+dated by the file's modification time unless `--now` is given.
+
+Progress is checkpointed to a JSON-lines journal (one line per finished
+file, appended as soon as its job completes), so an interrupted run picks up
+where it stopped: files already imported with the same size and mtime are
+skipped, failed ones are retried. A status line shows throughput and ETA
+while the import runs, and a docs/s and bytes/s summary is printed at the end.
+
+The data directory can be open in only one process, so stop the app (or
+point it at another directory) before importing into its data.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from akshrail import config
+from akshrail.documents import DOCUMENT_TYPES, UPLOAD_EXTENSIONS
+
+REPORT_INTERVAL = 1.0  # seconds between status lines
+
+
+def find_files(root: Path) -> list:
+    """(relative path, size, mtime) of every importable file under `root`, in a stable order."""
+    accepted = {f".{ext}" for ext in UPLOAD_EXTENSIONS}
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if Path(name).suffix.lower() not in accepted:
+                continue
+            path = Path(dirpath) / name
+            st = path.stat()
+            found.append((path.relative_to(root).as_posix(), st.st_size, st.st_mtime))
+    return found
+
+
+def default_checkpoint(data_dir: Path, root: Path) -> Path:
+    return data_dir / "imports" / f"{hashlib.sha1(str(root).encode()).hexdigest()[:12]}.jsonl"
+
+
+class Checkpoint:
+    """Append-only record of finished files; the last entry for a path wins."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.done = {}  # relative path -> (size, mtime) of successfully imported files
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # torn final write
+                    if entry["ok"]:
+                        self.done[entry["path"]] = (entry["size"], entry["mtime"])
+                    else:
+                        self.done.pop(entry["path"], None)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def is_done(self, rel: str, size: int, mtime: float) -> bool:
+        return self.done.get(rel) == (size, mtime)
+
+    def record(self, rel: str, size: int, mtime: float, ok: bool, detail: str):
+        entry = {"path": rel, "size": size, "mtime": mtime, "ok": ok, "detail": detail}
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        if ok:
+            self.done[rel] = (size, mtime)
+
+    def close(self):
+        self._file.close()
+
+
+class Progress:
+    def __init__(self, total_files: int, total_bytes: int, stream=sys.stderr):
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.stream = stream
+        self.files = self.bytes = self.failed = 0
+        self.started = time.perf_counter()
+        self._reported = 0.0
+
+    def add(self, size: int, ok: bool):
+        self.files += 1
+        self.bytes += size
+        self.failed += not ok
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def line(self) -> str:
+        elapsed = max(self.elapsed, 1e-9)
+        rate = self.bytes / elapsed
+        eta = (self.total_bytes - self.bytes) / rate if rate else float("inf")
+        return (f"{self.files}/{self.total_files} files  {self.bytes / 2**20:.1f}/{self.total_bytes / 2**20:.1f} MB  "
+                f"{self.files / elapsed:.1f} docs/s  {rate / 2**20:.2f} MB/s  ETA {_duration(eta)}"
+                + (f"  {self.failed} failed" if self.failed else ""))
+
+    def report(self, force: bool = False):
+        now = time.perf_counter()
+        if not force and now - self._reported < REPORT_INTERVAL:
+            return
+        self._reported = now
+        # Rewrite one line on a terminal; log a line per interval otherwise.
+        end = "\r" if self.stream.isatty() and not force else "\n"
+        print(self.line().ljust(100), end=end, file=self.stream, flush=True)
+
+
+def _duration(seconds: float) -> str:
+    if seconds == float("inf"):
+        return "--:--"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes:02d}:{seconds:02d}"
+
+
+def run_import(services, root: Path, files: list, checkpoint: Checkpoint, doc_type: str,
+               use_mtime: bool = True, progress: Progress = None) -> Progress:
+    """Ingest `files` (from `find_files`) and record each outcome; returns the final progress."""
+    pipeline = services.pipeline
+    progress = progress or Progress(len(files), sum(size for _, size, _ in files))
+    in_flight = {}  # job id -> (relative path, size, mtime)
+
+    def harvest():
+        # Jobs are collected as they finish so the checkpoint never lags far behind the pipeline.
+        for job_id, (rel, size, mtime) in list(in_flight.items()):
+            job = pipeline.job(job_id)
+            if job is not None and not job.finished:
+                continue
+            del in_flight[job_id]
+            ok = job is not None and job.status == "done"
+            detail = job.result.get("doc_id") if ok else (job.error if job is not None else "job record lost")
+            checkpoint.record(rel, size, mtime, ok, detail)
+            progress.add(size, ok)
+        progress.report()
+
+    try:
+        for rel, size, mtime in files:
+            # Wait for both the job and the byte limit, so submit never raises QueueFull mid-import.
+            while not pipeline.has_room(size):
+                harvest()
+                time.sleep(0.01)
+            uploaded_at = datetime.fromtimestamp(mtime) if use_mtime else None
+            with open(root / rel, "rb") as f:
+                job_id = services.submit_upload(f, Path(rel).name, Path(rel).name, doc_type, uploaded_at)
+            in_flight[job_id] = (rel, size, mtime)
+            harvest()
+    except KeyboardInterrupt:
+        print("\nInterrupted; finishing the files already queued (Ctrl-C again to abandon them)...",
+              file=sys.stderr)
+        raise
+    finally:
+        # Wait for queued files even on error: a file indexed but not checkpointed would be imported twice.
+        while in_flight:
+            harvest()
+            time.sleep(0.01)
+        progress.report(force=True)
+    return progress
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import a directory tree of documents through the ingest pipeline.")
+    parser.add_argument("root", help="directory to import (searched recursively)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="processes for the CPU-bound stages")
+    parser.add_argument("--doc-type", default="Other", choices=DOCUMENT_TYPES, help="document type to assign")
+    parser.add_argument("--now", action="store_true", help="date documents now instead of by file mtime")
+    parser.add_argument("--data-dir", help=f"data directory (default {config.DATA_DIR})")
+    parser.add_argument("--checkpoint", help="progress journal (default: one per root under <data-dir>/imports)")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and import everything again")
+    args = parser.parse_args(argv)
+
+    root = Path(args.root).resolve()
+    if not root.is_dir():
+        parser.error(f"{root} is not a directory")
+    data_dir = Path(args.data_dir or config.DATA_DIR)
+    checkpoint_path = Path(args.checkpoint) if args.checkpoint else default_checkpoint(data_dir, root)
+    if args.restart and checkpoint_path.exists():
+        checkpoint_path.unlink()
+
+    found = find_files(root)
+    checkpoint = Checkpoint(checkpoint_path)
+    todo = [f for f in found if not checkpoint.is_done(*f)]
+    print(f"{len(found)} importable files under {root}; {len(found) - len(todo)} already imported, "
+          f"{len(todo)} to go", file=sys.stderr)
+    if not todo:
+        checkpoint.close()
+        return 0
+
+    from akshrail.services import DataDirInUse, Services
+
+    try:
+        services = Services(data_dir, compute="process", workers=args.workers)
+    except DataDirInUse as exc:
+        checkpoint.close()
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    progress = Progress(len(todo), sum(size for _, size, _ in todo))
+    try:
+        run_import(services, root, todo, checkpoint, args.doc_type, not args.now, progress)
+    except KeyboardInterrupt:
+        print(f"Progress is saved in {checkpoint_path}; run again to resume.", file=sys.stderr)
+        return 130
+    finally:
+        services.close()
+        checkpoint.close()
+
+    elapsed = max(progress.elapsed, 1e-9)
+    print(f"Imported {progress.files - progress.failed} of {progress.files} files "
+          f"({progress.bytes / 2**20:.1f} MB) in {elapsed:.1f}s: "
+          f"{progress.files / elapsed:.2f} docs/s, {progress.bytes / elapsed / 2**20:.2f} MB/s"
+          + (f"; {progress.failed} failed, see {checkpoint_path}" if progress.failed else ""))
+    return 1 if progress.failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
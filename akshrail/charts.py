@@ -0,0 +1,102 @@
+"""Figure cache and server-side downsampling for the Plotly charts.
+
+Building a figure with plotly.express costs tens of milliseconds even for a
+handful of points, and every rerun used to pay it again. `FigureCache` keeps
+each figure's JSON keyed by (chart id, data version, parameters) and rebuilds
+only when the underlying store reports a new version or the user picks
+different options. A hit turns the JSON back into a Figure without
+re-validating it, since it was validated when first built.
+
+Long series are thinned to roughly one point per couple of pixels before
+they are plotted: `lttb` (Largest-Triangle-Three-Buckets) keeps the points
+that preserve the visual shape, `minmax` keeps each bucket's extremes so
+spikes are never lost.
+"""
+import json
+
+import numpy as np
+import plotly.graph_objects as go
+
+from akshrail import telemetry
+from akshrail.cache import TTLCache
+
+MAX_POINTS = 500  # a half-width chart is ~600 px wide
+
+
+# ---------- downsampling ----------
+def lttb(x, y, n_out: int) -> np.ndarray:
+    """Indices of `n_out` points chosen by Largest-Triangle-Three-Buckets; keeps the first and last."""
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)  # n_out - 2 buckets between the ends
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo, nhi = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        # Twice the area of the triangle (previous pick, candidate, next bucket's average).
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+
+def minmax(y, n_out: int) -> np.ndarray:
+    """Indices of the minimum and maximum of each of `n_out // 2` equal buckets, in order."""
+    y = np.asarray(y)
+    n = len(y)
+    if n_out >= n or n_out < 2:
+        return np.arange(n)
+    edges = np.linspace(0, n, n_out // 2 + 1).astype(np.int64)
+    picks = []
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        picks += [lo + int(y[lo:hi].argmin()), lo + int(y[lo:hi].argmax())]
+    return np.unique(picks)
+
+
+def downsample(y, max_points: int = MAX_POINTS, method: str = "lttb") -> np.ndarray:
+    """Indices of at most `max_points` points of an evenly spaced series."""
+    if method == "lttb":
+        return lttb(np.arange(len(y)), y, max_points)
+    if method == "minmax":
+        return minmax(y, max_points)
+    raise ValueError("method must be 'lttb' or 'minmax'")
+
+
+# ---------- figure cache ----------
+class FigureCache:
+    """Serialized figures shared by every session; stale versions age out of the LRU."""
+
+    def __init__(self, maxsize: int = 64):
+        self._cache = TTLCache(maxsize)
+
+    def get(self, chart_id: str, version, params: dict, build) -> go.Figure:
+        """The figure `build()` returns for this data version and these parameters, built once."""
+        key = (chart_id, version, tuple(sorted(params.items())))
+
+        def build_spec():
+            with telemetry.span(f"chart.build.{chart_id}"):
+                return build().to_json(validate=False)
+
+        with telemetry.span("chart.get"):
+            spec = self._cache.get_or_compute(key, build_spec)
+            return go.Figure(json.loads(spec), _validate=False)
+
+    def clear(self):
+        self._cache.clear()
+
+    @property
+    def hits(self) -> int:
+        return self._cache.hits
+
+    @property
+    def misses(self) -> int:
+        return self._cache.misses
+
+    @property
+    def hit_ratio(self) -> float:
+        return self._cache.hit_ratio
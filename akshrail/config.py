@@ -0,0 +1,17 @@
+"""Shared paths and settings for the AkshRail app and its tooling."""
+import os
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# Everything the app writes at runtime lives under DATA_DIR.
+DATA_DIR = Path(os.environ.get("AKSHRAIL_DATA_DIR", ROOT_DIR / "akshrail_data"))
+
+# Pre-built Lottie bundle (see `python -m akshrail.assets build-bundle`).
+ASSET_BUNDLE_DIR = Path(os.environ.get("AKSHRAIL_ASSET_BUNDLE", ROOT_DIR / "assets" / "lottie"))
+
+# When set, no network calls are made for static assets.
+OFFLINE = os.environ.get("AKSHRAIL_OFFLINE", "").lower() in ("1", "true", "yes")
+
+# Latency histograms for the System Health panel (see `akshrail.telemetry`).
+TELEMETRY = os.environ.get("AKSHRAIL_TELEMETRY", "1").lower() not in ("0", "false", "no")
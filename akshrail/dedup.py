@@ -0,0 +1,212 @@
+"""Exact and near-duplicate detection with MinHash signatures and LSH banding.
+
+Exact duplicates are found by content hash. Near duplicates use MinHash over
+word shingles: the fraction of equal signature slots estimates the Jaccard
+similarity of two documents' shingle sets. The signature is cut into bands;
+two documents become candidates when any band matches exactly, which with
+16 bands of 8 rows happens mostly above Jaccard ~0.7.
+
+Band keys live in a memory-mapped matrix (one row per ordinal). At open time
+each band's keys are argsorted once, so a lookup is a binary search per band;
+documents added later sit in a small dict until the sorted arrays are rebuilt.
+The row count in meta.json is written lazily; at open, rows past it that hold
+a signature (left by an unclean exit) are counted back in.
+"""
+import json
+import threading
+import time
+import zlib
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+from akshrail.mmapfiles import grow_memmap
+from akshrail.text import tokenize
+
+NUM_PERM = 128
+BANDS = 16
+SHINGLE_SIZE = 3
+NEAR_THRESHOLD = 0.6  # report candidates whose estimated Jaccard is at least this
+
+_EMPTY = np.uint32(0xFFFFFFFF)
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """Hashed word n-grams of `text` as a unique uint32 array."""
+    tokens = tokenize(text, stopwords=())
+    if len(tokens) < size:
+        grams = [" ".join(tokens)] if tokens else []
+    else:
+        grams = [" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)]
+    return np.unique(np.fromiter((zlib.crc32(g.encode()) for g in grams), dtype=np.uint32, count=len(grams)))
+
+
+class MinHasher:
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing: (a*x + b) mod 2**64, keep the high 32 bits.
+        self.a = rng.integers(1, 1 << 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self.b = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64)
+        self.num_perm = num_perm
+
+    def signatures(self, shingle_sets, chunk: int = 1024) -> np.ndarray:
+        """MinHash signatures (uint32) for many shingle sets in one vectorized pass."""
+        out = np.full((len(shingle_sets), self.num_perm), _EMPTY, dtype=np.uint32)
+        sizes = np.array([len(s) for s in shingle_sets], dtype=np.int64)
+        nonempty = np.flatnonzero(sizes)
+        if nonempty.size == 0:
+            return out
+        values = np.concatenate([shingle_sets[i] for i in nonempty]).astype(np.uint64)
+        owner = np.repeat(np.arange(nonempty.size), sizes[nonempty])
+        mins = np.full((nonempty.size, self.num_perm), _EMPTY, dtype=np.uint32)
+        for start in range(0, values.size, chunk):
+            x = values[start:start + chunk]
+            hashed = ((x[:, None] * self.a + self.b) >> np.uint64(32)).astype(np.uint32)  # small chunks stay in cache
+            # Shingles are grouped by document, so reduce each run then fold into mins.
+            run_owner = owner[start:start + chunk]
+            runs = np.flatnonzero(np.r_[True, run_owner[1:] != run_owner[:-1]])
+            ids = run_owner[runs]
+            mins[ids] = np.minimum(mins[ids], np.minimum.reduceat(hashed, runs, axis=0))
+        out[nonempty] = mins
+        return out
+
+    def signature(self, text: str) -> np.ndarray:
+        return self.signatures([shingles(text)])[0]
+
+
+DEFAULT_HASHER = MinHasher()
+
+
+def jaccard_estimate(sig: np.ndarray, others: np.ndarray) -> np.ndarray:
+    return np.mean(others == sig, axis=-1)
+
+
+class DuplicateIndex:
+    """Content-hash map plus an LSH index over MinHash signatures."""
+
+    def __init__(self, path, num_perm: int = NUM_PERM, bands: int = BANDS, near_threshold: float = NEAR_THRESHOLD):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.near_threshold = near_threshold
+        self._lock = threading.Lock()
+        self._band_mix = np.random.default_rng(7).integers(1, 1 << 63, size=self.rows, dtype=np.uint64) | np.uint64(1)
+        self._hashes = {}
+        self._hash_log = self.path / "content_hashes.jsonl"
+        if self._hash_log.exists():
+            with open(self._hash_log, encoding="utf-8") as f:
+                for line in f:
+                    sha, ordinal = json.loads(line)
+                    self._hashes.setdefault(sha, ordinal)
+        meta = self._read_meta()
+        self.n_rows = meta.get("n_rows", 0)
+        self._capacity = 0
+        self._sigs = self._keys = None
+        self._meta_written = 0.0
+        sig_file = self.path / "signatures.uint32"
+        on_disk = sig_file.stat().st_size // (4 * num_perm) if sig_file.exists() else 0
+        self._ensure_capacity(max(self.n_rows, on_disk, 1024))
+        self._recover_rows()
+        self._rebuild_sorted()
+
+    # ---------- public API ----------
+    def add(self, ordinal: int, content_hash: str, signature: np.ndarray) -> dict:
+        """Check, then record the document; the pair is atomic across uploads."""
+        with self._lock:
+            found = self._check(content_hash, signature)
+            if content_hash not in self._hashes:
+                self._hashes[content_hash] = ordinal
+                with open(self._hash_log, "a", encoding="utf-8") as f:
+                    f.write(json.dumps([content_hash, ordinal]) + "\n")
+            self._ensure_capacity(ordinal + 1)
+            self._sigs[ordinal] = signature
+            keys = self._band_keys(signature[None, :])[0]
+            self._keys[ordinal] = keys
+            if signature[0] != _EMPTY:
+                for band in range(self.bands):
+                    self._tail[band][int(keys[band])].append(ordinal)
+                self._tail_size += 1
+            if ordinal >= self.n_rows:
+                self.n_rows = ordinal + 1
+                if time.time() - self._meta_written > 1.0:  # flush() writes the final count
+                    self._write_meta()
+            if self._tail_size > max(1024, self._sorted_size // 10):
+                self._rebuild_sorted()
+            return found
+
+    def flush(self):
+        with self._lock:
+            self._sigs.flush()
+            self._keys.flush()
+            self._write_meta()
+
+    # ---------- internals ----------
+    def _check(self, content_hash: str, signature: np.ndarray) -> dict:
+        result = {"exact": self._hashes.get(content_hash), "near": []}
+        if signature[0] == _EMPTY:  # no text, nothing to compare
+            return result
+        keys = self._band_keys(signature[None, :])[0]
+        candidates = set()
+        for band in range(self.bands):
+            key = keys[band]
+            sorted_keys, sorted_ords = self._sorted[band]
+            lo = np.searchsorted(sorted_keys, key, side="left")
+            hi = np.searchsorted(sorted_keys, key, side="right")
+            candidates.update(sorted_ords[lo:hi].tolist())
+            candidates.update(self._tail[band].get(int(key), ()))
+        candidates.discard(result["exact"])
+        if candidates:
+            ords = np.fromiter(candidates, dtype=np.int64)
+            sims = jaccard_estimate(signature, self._sigs[ords])
+            keep = sims >= self.near_threshold
+            result["near"] = sorted(zip(ords[keep].tolist(), sims[keep].tolist()), key=lambda p: -p[1])
+        return result
+
+    def _band_keys(self, sigs: np.ndarray) -> np.ndarray:
+        """One uint64 key per band: a multiplicative hash of that band's rows."""
+        banded = sigs.astype(np.uint64).reshape(len(sigs), self.bands, self.rows)
+        return (banded * self._band_mix).sum(axis=2, dtype=np.uint64)
+
+    def _recover_rows(self):
+        """Count in rows added after meta.json was last written."""
+        written = np.flatnonzero(np.asarray(self._sigs[self.n_rows:, 0]) != _EMPTY)
+        if written.size:
+            end = self.n_rows + int(written[-1]) + 1
+            # The band keys may not have reached the file; they follow from the signatures.
+            self._keys[self.n_rows:end] = self._band_keys(np.asarray(self._sigs[self.n_rows:end]))
+            self.n_rows = end
+
+    def _rebuild_sorted(self):
+        keys = np.asarray(self._keys[:self.n_rows])
+        live = np.flatnonzero(np.asarray(self._sigs[:self.n_rows, 0]) != _EMPTY)
+        self._sorted = []
+        for band in range(self.bands):
+            band_keys = keys[live, band]
+            order = np.argsort(band_keys, kind="stable")
+            self._sorted.append((band_keys[order], live[order]))
+        self._sorted_size = live.size
+        self._tail = [defaultdict(list) for _ in range(self.bands)]
+        self._tail_size = 0
+
+    def _ensure_capacity(self, rows: int):
+        if rows <= self._capacity:
+            return
+        capacity = max(rows, 2 * self._capacity)
+        self._sigs = grow_memmap(self.path / "signatures.uint32", np.uint32, (capacity, self.num_perm), fill=0xFF)
+        self._keys = grow_memmap(self.path / "band_keys.uint64", np.uint64, (capacity, self.bands))
+        self._capacity = capacity
+
+    def _read_meta(self) -> dict:
+        try:
+            return json.loads((self.path / "meta.json").read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _write_meta(self):
+        (self.path / "meta.json").write_text(json.dumps({"n_rows": self.n_rows}))
+        self._meta_written = time.time()
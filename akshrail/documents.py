@@ -0,0 +1,26 @@
+"""Document model and the vocabularies shared by the upload and search pages."""
+from dataclasses import dataclass
+from datetime import datetime
+
+DOCUMENT_TYPES = ["Report", "Invoice", "Drawing", "Policy", "Minutes", "Legal", "Other"]
+UPLOAD_EXTENSIONS = ["pdf", "docx", "jpg", "png", "txt", "xlsx"]
+STATUSES = ["Draft", "Pending Review", "Under Review", "Approved", "Finalized", "Archived", "Rejected"]
+DEFAULT_STATUS = "Pending Review"
+REVIEW_STATUSES = ("Pending Review", "Under Review")  # counted as "awaiting review"
+
+
+@dataclass
+class Document:
+    ordinal: int  # dense 0-based number, used as the row/doc id by the indexes
+    doc_id: str  # display id, e.g. DOC-0042
+    title: str
+    doc_type: str
+    filename: str
+    uploaded_at: datetime
+    status: str = DEFAULT_STATUS
+    summary: str = ""
+    content_hash: str = ""
+
+
+def format_doc_id(ordinal: int) -> str:
+    return f"DOC-{ordinal:04d}"
@@ -0,0 +1,167 @@
+"""Plain-text extraction for the upload formats, using only the standard library.
+
+Scanned images carry no text layer; they come back empty until an OCR engine
+is wired in.
+
+Uploads can be hundreds of MB, so paths are never read whole: PDFs are
+scanned through a memory map, zip-based formats are read member by member,
+and only the first `MAX_TEXT_BYTES` of a text file are indexed.
+"""
+import codecs
+import contextlib
+import io
+import mmap
+import re
+import zipfile
+import zlib
+from pathlib import Path
+from xml.etree import ElementTree
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_S = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+_PDF_STREAM = re.compile(rb"<<(.*?)>>\s*stream\r?\n(.*?)\r?\nendstream", re.S)
+_PDF_TEXT_OP = re.compile(rb"\[(.*?)\]\s*TJ|\((.*?)(?<!\\)\)\s*(?:Tj|'|\")|(T\*|Td|TD|ET)", re.S)
+_PDF_STRING = re.compile(rb"\((.*?)(?<!\\)\)", re.S)
+MAX_TEXT_BYTES = 16 * 1024 * 1024
+
+_PDF_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"", b"f": b"", b"(": b"(", b")": b")", b"\\": b"\\"}
+
+
+def extension(filename: str) -> str:
+    return Path(filename).suffix.lower().lstrip(".")
+
+
+def extract_text(source, filename: str) -> str:
+    """Return the text of `source` (bytes or a path), dispatching on the file extension."""
+    ext = extension(filename)
+    handler = _HANDLERS.get(ext)
+    if handler is None:
+        return ""
+    try:
+        return handler(source)
+    except (zipfile.BadZipFile, ElementTree.ParseError, KeyError, ValueError, zlib.error):
+        # A corrupt upload should produce an empty document, not a failed job.
+        return ""
+
+
+def decode_text(data: bytes, complete: bool = True) -> str:
+    """Decode a text file's bytes, UTF-8 if they are valid and Latin-1 otherwise.
+
+    With `complete=False` the bytes are a prefix of the file, and a character
+    cut off at the end is dropped rather than treated as invalid UTF-8.
+    """
+    try:
+        return codecs.getincrementaldecoder("utf-8-sig")().decode(data, final=complete)
+    except UnicodeDecodeError:
+        return data.decode("latin-1")
+
+
+@contextlib.contextmanager
+def _mapped(source):
+    """The bytes of `source`, memory-mapped when it is a path."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        yield source
+        return
+    with open(source, "rb") as f:
+        if not f.seek(0, io.SEEK_END):
+            yield b""  # an empty file cannot be mapped
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield data
+
+
+def _open_zip(source) -> zipfile.ZipFile:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return zipfile.ZipFile(io.BytesIO(source))
+    return zipfile.ZipFile(source)
+
+
+def _txt(source) -> str:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        data = bytes(source[:MAX_TEXT_BYTES])
+    else:
+        with open(source, "rb") as f:
+            data = f.read(MAX_TEXT_BYTES)
+    return decode_text(data, complete=len(data) < MAX_TEXT_BYTES)
+
+
+def _docx(source) -> str:
+    paragraphs = []
+    with _open_zip(source) as zf, zf.open("word/document.xml") as f:
+        for _, elem in ElementTree.iterparse(f):
+            if elem.tag == f"{_W}p":
+                paragraphs.append("".join(t.text or "" for t in elem.iter(f"{_W}t")))
+                elem.clear()
+    return "\n".join(p for p in paragraphs if p)
+
+
+def _xlsx(source) -> str:
+    cells = []
+    with _open_zip(source) as zf:
+        if "xl/sharedStrings.xml" in zf.namelist():
+            with zf.open("xl/sharedStrings.xml") as f:
+                for _, elem in ElementTree.iterparse(f):
+                    if elem.tag == f"{_S}si":
+                        cells.append("".join(t.text or "" for t in elem.iter(f"{_S}t")))
+                        elem.clear()
+        for name in sorted(n for n in zf.namelist() if n.startswith("xl/worksheets/sheet")):
+            with zf.open(name) as f:
+                for _, elem in ElementTree.iterparse(f):
+                    if elem.tag == f"{_S}is":  # inline strings are not in sharedStrings
+                        cells.append("".join(t.text or "" for t in elem.iter(f"{_S}t")))
+                        elem.clear()
+    return "\n".join(c for c in cells if c)
+
+
+def _pdf_unescape(raw: bytes) -> bytes:
+    return re.sub(rb"\\([nrtbf()\\]|[0-7]{1,3})",
+                  lambda m: _PDF_ESCAPES[m.group(1)] if m.group(1) in _PDF_ESCAPES
+                  else bytes([int(m.group(1), 8) & 0xFF]), raw)
+
+
+def _pdf(source) -> str:
+    with _mapped(source) as data:
+        return _pdf_text(data)
+
+
+def _pdf_text(data) -> str:
+    chunks = []
+    for match in _PDF_STREAM.finditer(data):  # a stream's body is copied out only if it is decoded
+        header = match.group(1)
+        if b"/FlateDecode" in header:
+            try:
+                body = zlib.decompress(match.group(2))
+            except zlib.error:
+                continue
+        elif b"/Filter" in header:
+            continue  # images and other encodings carry no text operators
+        else:
+            body = match.group(2)
+        line = []
+        for tj_array, tj, breaker in _PDF_TEXT_OP.findall(body):
+            if breaker:
+                if line:
+                    chunks.append(b"".join(line))
+                    line = []
+                continue
+            parts = _PDF_STRING.findall(tj_array) if tj_array else [tj]
+            line.extend(_pdf_unescape(p) for p in parts)
+        if line:
+            chunks.append(b"".join(line))
+    text = "\n".join(c.decode("latin-1") for c in chunks)
+    return re.sub(r"[ \t]+", " ", text).strip()
+
+
+def _image(source) -> str:
+    return ""
+
+
+_HANDLERS = {
+    "txt": _txt,
+    "docx": _docx,
+    "xlsx": _xlsx,
+    "pdf": _pdf,
+    "jpg": _image,
+    "png": _image,
+}
@@ -0,0 +1,142 @@
+"""Bitmap indexes for the search facets: document type, status and upload month.
+
+Each facet value owns one packed bitmap row over document ordinals (see
+`akshrail.bitmaps`), kept as a matrix per field. A filter is the AND across
+fields of the OR of the selected values, and is handed to the retrievers so
+excluded documents are never scored. Facet counts are one `bitwise_count`
+over a field's matrix ANDed with the matching set.
+
+The index is maintained alongside the metastore and saved on close together
+with the metastore's change sequence; if the two disagree at open the
+caller rebuilds it from the metastore.
+"""
+import json
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from akshrail import bitmaps
+
+FIELDS = ("doc_type", "status", "month")
+
+
+def facet_values(doc) -> dict:
+    return {"doc_type": doc.doc_type, "status": doc.status, "month": f"{doc.uploaded_at:%Y-%m}"}
+
+
+class FacetIndex:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._values = {f: [] for f in FIELDS}
+        self._rows = {f: np.zeros((0, 128), dtype=np.uint8) for f in FIELDS}
+        self.stamp = None
+        self.version = 0
+        self._load()
+
+    # ---------- updates ----------
+    def add(self, ordinal: int, values: dict):
+        with self._lock:
+            for field in FIELDS:
+                self._set(field, values[field], ordinal, True)
+            self.version += 1
+
+    def move(self, ordinal: int, field: str, old: str, new: str):
+        with self._lock:
+            self._set(field, old, ordinal, False)
+            self._set(field, new, ordinal, True)
+            self.version += 1
+
+    def rebuild(self, documents, stamp=None):
+        """Replace everything from Document rows, e.g. `MetaStore.iter_documents()`."""
+        with self._lock:
+            self._values = {f: [] for f in FIELDS}
+            self._rows = {f: np.zeros((0, 128), dtype=np.uint8) for f in FIELDS}
+            for doc in documents:
+                for field, value in facet_values(doc).items():
+                    self._set(field, value, doc.ordinal, True)
+            self.version += 1
+        self.save(stamp)
+
+    def save(self, stamp=None):
+        with self._lock:
+            self.stamp = stamp
+            tmp = self.path / "facets.npz.tmp"
+            with open(tmp, "wb") as f:
+                np.savez(f, **self._rows)
+            os.replace(tmp, self.path / "facets.npz")
+            meta = {"values": self._values, "stamp": stamp}
+            (self.path / "meta.json.tmp").write_text(json.dumps(meta))
+            os.replace(self.path / "meta.json.tmp", self.path / "meta.json")
+
+    # ---------- queries ----------
+    def mask(self, filters: dict):
+        """Bitmap of documents passing every filter ({field: selected values}); None when unfiltered."""
+        result = None
+        with self._lock:
+            for field, selected in filters.items():
+                if not selected:
+                    continue
+                rows = [self._values[field].index(v) for v in selected if v in self._values[field]]
+                field_bits = np.bitwise_or.reduce(self._rows[field][rows], axis=0) if rows \
+                    else bitmaps.empty()
+                result = field_bits if result is None else bitmaps.intersect(result, field_bits)
+        return result
+
+    def counts(self, matched: np.ndarray, filters: dict = None) -> dict:
+        """{field: {value: n}} over the `matched` bitmap.
+
+        Counts for a field ignore that field's own filter but apply the others,
+        so every option shows how many hits selecting it would give.
+        """
+        filters = filters or {}
+        out = {}
+        for field in FIELDS:
+            others = {f: v for f, v in filters.items() if f != field}
+            base = matched
+            other_mask = self.mask(others)
+            if other_mask is not None:
+                base = bitmaps.intersect(base, other_mask)
+            with self._lock:
+                rows, values = self._rows[field], list(self._values[field])
+                n = min(rows.shape[1], base.size)
+                per_value = np.bitwise_count(rows[:, :n] & base[:n]).sum(axis=1) if values else []
+            out[field] = {v: int(c) for v, c in zip(values, per_value) if c}
+        return out
+
+    def values(self, field: str) -> list:
+        with self._lock:
+            return sorted(self._values[field])
+
+    # ---------- internals ----------
+    def _set(self, field: str, value: str, ordinal: int, on: bool):
+        values, rows = self._values[field], self._rows[field]
+        if value not in values:
+            if not on:
+                return
+            values.append(value)
+            rows = np.vstack([rows, np.zeros((1, rows.shape[1]), dtype=np.uint8)])
+        if ordinal >> 3 >= rows.shape[1]:
+            grown = np.zeros((rows.shape[0], max(2 * rows.shape[1], (ordinal >> 3) + 1)), dtype=np.uint8)
+            grown[:, :rows.shape[1]] = rows
+            rows = grown
+        row, mask = values.index(value), np.uint8(1 << (ordinal & 7))
+        if on:
+            rows[row, ordinal >> 3] |= mask
+        else:
+            rows[row, ordinal >> 3] &= ~mask
+        self._rows[field] = rows
+
+    def _load(self):
+        try:
+            meta = json.loads((self.path / "meta.json").read_text())
+            with np.load(self.path / "facets.npz") as data:
+                rows = {f: data[f] for f in FIELDS}
+        except (OSError, ValueError, KeyError):
+            return
+        self._values = {f: meta["values"][f] for f in FIELDS}
+        self._rows = rows
+        self.stamp = meta["stamp"]
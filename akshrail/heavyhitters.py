@@ -0,0 +1,148 @@
+"""Fixed-memory tracking of the most searched keywords.
+
+Each day of the window gets a Count-Min sketch (approximate count of any
+keyword) and a Space-Saving summary (the keywords that can possibly be
+frequent). A multi-day window adds the days' sketches and ranks the union
+of their candidates by the summed estimate, so memory is the same whether
+the app sees a thousand queries or millions, and no query log is kept.
+Days are slots in a ring and a slot is cleared when its day comes round
+again, so old traffic drops out of the windows on its own.
+"""
+import json
+import os
+import threading
+import time
+import zlib
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+from akshrail.text import tokenize
+
+WINDOWS = {"today": 1, "7d": 7, "30d": 30}
+
+
+class CountMinSketch:
+    """Never under-counts; over-counts by at most ~e/width of the total with high probability."""
+
+    def __init__(self, width: int = 2048, depth: int = 4, table: np.ndarray = None):
+        self.width = width
+        self.depth = depth
+        self.table = table if table is not None else np.zeros((depth, width), dtype=np.uint32)
+
+    def _cells(self, key: str) -> np.ndarray:
+        data = key.encode()
+        return np.array([zlib.crc32(data, seed * 0x9E3779B1 & 0xFFFFFFFF) % self.width
+                         for seed in range(1, self.depth + 1)])
+
+    def add(self, key: str, n: int = 1):
+        # Conservative update: only raise the cells that are at the minimum.
+        # Estimates stay upper bounds (also when sketches are summed) but drift far less.
+        rows, cells = np.arange(self.depth), self._cells(key)
+        current = self.table[rows, cells]
+        self.table[rows, cells] = np.maximum(current, current.min() + n)
+
+    def estimate(self, key: str) -> int:
+        return int(self.table[np.arange(self.depth), self._cells(key)].min())
+
+
+class SpaceSaving:
+    """The `capacity` heaviest keys; any key with count above total/capacity is guaranteed to be kept."""
+
+    def __init__(self, capacity: int = 64, counts: dict = None):
+        self.capacity = capacity
+        self.counts = counts or {}
+
+    def add(self, key: str, n: int = 1):
+        if key in self.counts or len(self.counts) < self.capacity:
+            self.counts[key] = self.counts.get(key, 0) + n
+            return
+        victim = min(self.counts, key=self.counts.get)
+        self.counts[key] = self.counts.pop(victim) + n
+
+
+class KeywordTracker:
+    """Per-day sketches for the last `days` days, shared by every session and saved periodically."""
+
+    def __init__(self, path, days: int = 30, width: int = 2048, depth: int = 4, capacity: int = 64,
+                 save_interval: float = 30.0):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.days = days
+        self.capacity = capacity
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self._tables = np.zeros((days, depth, width), dtype=np.uint32)
+        self._sketches = [CountMinSketch(width, depth, self._tables[i]) for i in range(days)]
+        self._summaries = [SpaceSaving(capacity) for _ in range(days)]
+        self._slot_day = [0] * days  # date.toordinal() held by each slot, 0 = unused
+        self._dirty = False
+        self._saved_at = time.time()
+        self.version = 0  # bumped on every recorded query
+        self._load()
+
+    def record(self, query: str, when: date = None):
+        """Count each distinct keyword of a submitted query once."""
+        keywords = set(tokenize(query))
+        if not keywords:
+            return
+        with self._lock:
+            slot = self._slot((when or date.today()).toordinal())
+            for keyword in keywords:
+                self._sketches[slot].add(keyword)
+                self._summaries[slot].add(keyword)
+            self._dirty = True
+            self.version += 1
+            due = time.time() - self._saved_at >= self.save_interval
+        if due:
+            self.flush()
+
+    def top(self, k: int = 5, window: str = "7d", today: date = None) -> list:
+        """(keyword, estimated count) pairs for the last 1, 7 or 30 days, most searched first."""
+        span = min(WINDOWS[window], self.days)
+        last = (today or date.today()).toordinal()
+        with self._lock:
+            slots = [i for i, day in enumerate(self._slot_day) if day and last - span < day <= last]
+            if not slots:
+                return []
+            candidates = set().union(*(self._summaries[i].counts for i in slots))
+            window_sketch = CountMinSketch(self._sketches[0].width, self._sketches[0].depth,
+                                           self._tables[slots].sum(axis=0, dtype=np.uint32))
+        scored = [(kw, window_sketch.estimate(kw)) for kw in candidates]
+        return sorted(scored, key=lambda p: (-p[1], p[0]))[:k]
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp = self.path / "sketches.npy.tmp"
+            with open(tmp, "wb") as f:
+                np.save(f, self._tables)
+            os.replace(tmp, self.path / "sketches.npy")
+            state = {"slot_day": self._slot_day, "summaries": [s.counts for s in self._summaries]}
+            (self.path / "summaries.json.tmp").write_text(json.dumps(state))
+            os.replace(self.path / "summaries.json.tmp", self.path / "summaries.json")
+            self._dirty = False
+            self._saved_at = time.time()
+
+    # ---------- internals ----------
+    def _slot(self, day: int) -> int:
+        slot = day % self.days
+        if self._slot_day[slot] != day:  # a new day reuses the slot of `days` days ago
+            self._tables[slot] = 0
+            self._summaries[slot] = SpaceSaving(self.capacity)
+            self._slot_day[slot] = day
+        return slot
+
+    def _load(self):
+        try:
+            tables = np.load(self.path / "sketches.npy")
+            state = json.loads((self.path / "summaries.json").read_text())
+        except (OSError, ValueError):
+            return
+        if tables.shape != self._tables.shape or len(state["slot_day"]) != self.days:
+            return  # saved with different dimensions; start over
+        self._tables[:] = tables
+        self._slot_day = state["slot_day"]
+        self._summaries = [SpaceSaving(self.capacity, counts) for counts in state["summaries"]]
@@ -0,0 +1,24 @@
+"""Stage functions for the upload pipeline.
+
+The CPU-bound stages are module-level and only touch the job context so they
+can run in a worker process. Stages that write to shared stores are built by
+`akshrail.services` and run in the owning process.
+"""
+from akshrail.dedup import DEFAULT_HASHER, shingles
+from akshrail.extract import extract_text
+from akshrail.vectors import DEFAULT_ENCODER
+
+
+def extract_stage(ctx: dict) -> dict:
+    # The file is already in the blob store; workers read it by path rather
+    # than receiving the bytes through the job context.
+    text = extract_text(ctx["blob"], ctx["filename"])
+    return {"text": text, "chars": len(text)}
+
+
+def embed_stage(ctx: dict) -> dict:
+    return {"embedding": DEFAULT_ENCODER.encode(f"{ctx['title']} {ctx.get('text', '')}")}
+
+
+def fingerprint_stage(ctx: dict) -> dict:
+    return {"minhash": DEFAULT_HASHER.signatures([shingles(ctx.get("text", ""))])[0]}
@@ -0,0 +1,225 @@
+"""SQLite metadata store with materialized counters for the Dashboard KPIs.
+
+Every write updates the `counters` table in the same transaction as the
+document row, so the totals are always consistent and reading a KPI never
+runs COUNT(*). On top of that, `kpis()` is served from a process-wide cache
+that is invalidated by SQLite's `PRAGMA data_version`, which changes whenever
+another connection commits.
+"""
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from akshrail.documents import DEFAULT_STATUS, REVIEW_STATUSES, Document, format_doc_id
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    ordinal      INTEGER PRIMARY KEY,
+    doc_id       TEXT NOT NULL UNIQUE,
+    title        TEXT NOT NULL,
+    doc_type     TEXT NOT NULL,
+    filename     TEXT NOT NULL,
+    uploaded_at  TEXT NOT NULL,
+    status       TEXT NOT NULL,
+    summary      TEXT NOT NULL DEFAULT '',
+    content_hash TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS documents_status ON documents (status);
+CREATE INDEX IF NOT EXISTS documents_uploaded_at ON documents (uploaded_at);
+CREATE INDEX IF NOT EXISTS documents_type ON documents (doc_type);
+CREATE INDEX IF NOT EXISTS documents_content_hash ON documents (content_hash);
+
+CREATE TABLE IF NOT EXISTS status_history (
+    id          INTEGER PRIMARY KEY,
+    ordinal     INTEGER NOT NULL REFERENCES documents (ordinal),
+    old_status  TEXT,
+    new_status  TEXT NOT NULL,
+    changed_at  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS status_history_ordinal ON status_history (ordinal, changed_at);
+CREATE INDEX IF NOT EXISTS status_history_changed_at ON status_history (changed_at);
+
+CREATE TABLE IF NOT EXISTS counters (
+    name  TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS summaries (
+    content_hash TEXT PRIMARY KEY,
+    summary      TEXT NOT NULL
+);
+"""
+
+_COLUMNS = "ordinal, doc_id, title, doc_type, filename, uploaded_at, status, summary, content_hash"
+
+
+def _row_to_document(row) -> Document:
+    ordinal, doc_id, title, doc_type, filename, uploaded_at, status, summary, content_hash = row
+    return Document(ordinal, doc_id, title, doc_type, filename, datetime.fromisoformat(uploaded_at),
+                    status, summary, content_hash)
+
+
+def _month_counter(when: datetime) -> str:
+    return f"month:{when:%Y-%m}"
+
+
+class MetaStore:
+    """Thread-safe document catalogue; one connection per thread, one writer at a time."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        # A dedicated connection whose data_version moves on every commit made
+        # through any other connection, which is exactly the invalidation signal.
+        self._probe = sqlite3.connect(self.path, check_same_thread=False)
+        self._probe_lock = threading.Lock()
+        self._kpi_cache = (None, None)  # (data_version, kpis)
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    # ---------- writes ----------
+    def add(self, title: str, doc_type: str, filename: str, summary: str = "", content_hash: str = "",
+            uploaded_at: datetime = None, status: str = DEFAULT_STATUS) -> Document:
+        uploaded_at = uploaded_at or datetime.now()
+        with self._write_lock, self._conn() as conn:
+            conn.execute("BEGIN IMMEDIATE")  # other processes may be inserting too
+            ordinal = conn.execute("SELECT COALESCE(MAX(ordinal) + 1, 0) FROM documents").fetchone()[0]
+            doc = Document(ordinal, format_doc_id(ordinal), title, doc_type, filename, uploaded_at,
+                           status, summary, content_hash)
+            conn.execute(f"INSERT INTO documents ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                         (doc.ordinal, doc.doc_id, title, doc_type, filename, uploaded_at.isoformat(),
+                          status, summary, content_hash))
+            conn.execute("INSERT INTO status_history (ordinal, old_status, new_status, changed_at) "
+                         "VALUES (?, NULL, ?, ?)", (ordinal, status, uploaded_at.isoformat()))
+            self._bump(conn, {"total": 1, f"status:{status}": 1, _month_counter(uploaded_at): 1})
+        return doc
+
+    def set_status(self, ordinal: int, status: str, when: datetime = None) -> Document:
+        """Change a document's status; returns the document as it was before."""
+        when = when or datetime.now()
+        with self._write_lock, self._conn() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(f"SELECT {_COLUMNS} FROM documents WHERE ordinal = ?", (ordinal,)).fetchone()
+            if row is None:
+                raise KeyError(ordinal)
+            before = _row_to_document(row)
+            if before.status != status:
+                conn.execute("UPDATE documents SET status = ? WHERE ordinal = ?", (status, ordinal))
+                conn.execute("INSERT INTO status_history (ordinal, old_status, new_status, changed_at) "
+                             "VALUES (?, ?, ?, ?)", (ordinal, before.status, status, when.isoformat()))
+                self._bump(conn, {f"status:{before.status}": -1, f"status:{status}": 1})
+        return before
+
+    def put_summaries(self, summaries: dict):
+        """Remember {content_hash: summary} so the same content is never summarized again."""
+        with self._write_lock, self._conn() as conn:
+            conn.executemany("INSERT OR REPLACE INTO summaries (content_hash, summary) VALUES (?, ?)",
+                             list(summaries.items()))
+
+    def import_jsonl(self, path: Path) -> int:
+        """One-off migration from the JSON-lines registry used before this store existed."""
+        rows = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                rows.append(json.loads(line))
+        for row in sorted(rows, key=lambda r: r["ordinal"]):
+            self.add(row["title"], row["doc_type"], row["filename"], row.get("summary", ""),
+                     uploaded_at=datetime.fromisoformat(row["uploaded_at"]),
+                     status=row.get("status", DEFAULT_STATUS))
+        return len(rows)
+
+    # ---------- reads ----------
+    def get(self, ordinal: int) -> Document:
+        row = self._conn().execute(f"SELECT {_COLUMNS} FROM documents WHERE ordinal = ?", (ordinal,)).fetchone()
+        if row is None:
+            raise KeyError(ordinal)
+        return _row_to_document(row)
+
+    def get_many(self, ordinals) -> dict:
+        """Documents for several ordinals in one query, keyed by ordinal."""
+        ordinals = [int(o) for o in ordinals]
+        if not ordinals:
+            return {}
+        rows = self._conn().execute(
+            f"SELECT {_COLUMNS} FROM documents WHERE ordinal IN (SELECT value FROM json_each(?))",
+            (json.dumps(ordinals),)).fetchall()
+        return {row[0]: _row_to_document(row) for row in rows}
+
+    def summaries(self, content_hashes) -> dict:
+        """Stored summaries for the given content hashes; unknown hashes are left out."""
+        hashes = list(content_hashes)
+        if not hashes:
+            return {}
+        return dict(self._conn().execute(
+            "SELECT content_hash, summary FROM summaries WHERE content_hash IN (SELECT value FROM json_each(?))",
+            (json.dumps(hashes),)).fetchall())
+
+    def activity_since(self, seq: int, limit: int = 10_000) -> list:
+        """History entries after `seq` in order, joined with their documents (see `ActivityLog`)."""
+        return self._conn().execute(
+            "SELECT h.id, h.changed_at, h.ordinal, d.doc_id, d.title, d.doc_type, h.old_status, h.new_status "
+            "FROM status_history h JOIN documents d ON d.ordinal = h.ordinal WHERE h.id > ? ORDER BY h.id LIMIT ?",
+            (seq, limit)).fetchall()
+
+    def iter_documents(self, batch: int = 1000):
+        last = -1
+        while True:
+            rows = self._conn().execute(
+                f"SELECT {_COLUMNS} FROM documents WHERE ordinal > ? ORDER BY ordinal LIMIT ?", (last, batch)).fetchall()
+            if not rows:
+                return
+            yield from (_row_to_document(r) for r in rows)
+            last = rows[-1][0]
+
+    def counter(self, name: str) -> int:
+        row = self._conn().execute("SELECT value FROM counters WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else 0
+
+    def change_seq(self) -> int:
+        """Grows with every insert and status change; derived indexes store it to detect staleness."""
+        return self._conn().execute("SELECT COALESCE(MAX(id), 0) FROM status_history").fetchone()[0]
+
+    def __len__(self):
+        return self.counter("total")
+
+    @property
+    def version(self) -> int:
+        with self._probe_lock:
+            return self._probe.execute("PRAGMA data_version").fetchone()[0]
+
+    def kpis(self, now: datetime = None) -> dict:
+        """Dashboard tiles, cached until the database changes."""
+        now = now or datetime.now()
+        version = self.version
+        cached_version, cached = self._kpi_cache
+        if cached_version == version and cached["month"] == f"{now:%Y-%m}":
+            return cached
+        counters = dict(self._conn().execute("SELECT name, value FROM counters").fetchall())
+        kpis = {
+            "total": counters.get("total", 0),
+            "awaiting_review": sum(counters.get(f"status:{s}", 0) for s in REVIEW_STATUSES),
+            "this_month": counters.get(_month_counter(now), 0),
+            "month": f"{now:%Y-%m}",
+        }
+        self._kpi_cache = (version, kpis)
+        return kpis
+
+    # ---------- internals ----------
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @staticmethod
+    def _bump(conn, deltas: dict):
+        conn.executemany("INSERT INTO counters (name, value) VALUES (?, ?) "
+                         "ON CONFLICT (name) DO UPDATE SET value = value + excluded.value",
+                         list(deltas.items()))
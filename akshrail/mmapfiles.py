@@ -0,0 +1,21 @@
+"""Growable memory-mapped arrays, shared by the vector store and the duplicate index."""
+from pathlib import Path
+
+import numpy as np
+
+
+def grow_memmap(path: Path, dtype, shape, fill: int = 0) -> np.memmap:
+    """Map `path` as an array of `shape`, extending the file first if it is smaller.
+
+    New bytes are zero, or `fill` (a byte value) when given, so unwritten rows
+    can read as "empty".
+    """
+    nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    with open(path, "ab") as f:
+        size = f.tell()
+        if size < nbytes:
+            if fill:
+                f.write(bytes([fill]) * (nbytes - size))
+            else:
+                f.truncate(nbytes)
+    return np.memmap(path, dtype=dtype, mode="r+", shape=shape)
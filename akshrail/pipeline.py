@@ -0,0 +1,198 @@
+"""Background job queue that runs uploads through ordered processing stages.
+
+`IngestPipeline.submit` returns a job id immediately; a small pool of worker
+threads runs each job's stages in order and records per-stage progress that
+the UI can poll. CPU-heavy stages can be pushed into a process pool so they
+never hold the GIL the Streamlit script threads need.
+
+Backpressure: at most `max_pending` jobs (and `max_pending_bytes` of payload)
+may be queued or running at once. Beyond that `submit` raises `QueueFull`
+instead of letting a burst of large uploads pile up behind the workers.
+"""
+import copy
+import multiprocessing
+import signal
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from akshrail import telemetry
+
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+QUEUED = "queued"
+
+
+class QueueFull(RuntimeError):
+    """Raised by `IngestPipeline.submit` when the backlog limit is reached."""
+
+
+@dataclass
+class Stage:
+    name: str
+    fn: Callable[[dict], Optional[dict]]  # takes the job context, returns updates to merge into it
+    cpu_bound: bool = False  # run in the compute pool; fn and context must then be picklable
+
+
+@dataclass
+class StageProgress:
+    name: str
+    status: str = PENDING
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def elapsed(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.time()) - self.started_at
+
+
+@dataclass
+class Job:
+    job_id: str
+    label: str
+    size: int
+    stages: list
+    submitted_at: float = field(default_factory=time.time)
+    status: str = QUEUED
+    error: Optional[str] = None
+    result: dict = field(default_factory=dict)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    @property
+    def progress(self) -> float:
+        done = sum(s.status == DONE for s in self.stages)
+        return done / len(self.stages) if self.stages else 1.0
+
+    @property
+    def current_stage(self) -> Optional[str]:
+        for s in self.stages:
+            if s.status in (RUNNING, FAILED):
+                return s.name
+        return None
+
+
+class IngestPipeline:
+    def __init__(self, stages, max_workers: int = 2, max_pending: int = 16,
+                 max_pending_bytes: int = 512 * 1024 * 1024, compute: str = "thread",
+                 compute_workers: int = None, keep_finished: int = 200,
+                 private_keys=("data", "text")):
+        self.stages = list(stages)
+        self.private_keys = set(private_keys)  # context keys too bulky to keep on the job record
+        self.max_pending = max_pending
+        self.max_pending_bytes = max_pending_bytes
+        self.keep_finished = keep_finished
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._pending_bytes = 0
+        self._workers = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingest")
+        if compute == "process":
+            # spawn, not fork: forking a process that runs server threads is unsafe.
+            # Workers ignore Ctrl-C; the owning process decides whether queued jobs finish.
+            self._compute = ProcessPoolExecutor(max_workers=compute_workers or max_workers,
+                                                mp_context=multiprocessing.get_context("spawn"),
+                                                initializer=signal.signal, initargs=(signal.SIGINT, signal.SIG_IGN))
+        elif compute == "thread":
+            self._compute = None
+        else:
+            raise ValueError(f"compute must be 'thread' or 'process', not {compute!r}")
+
+    # ---------- submission ----------
+    def submit(self, context: dict, label: str = "", size: int = 0) -> str:
+        """Queue a job and return its id; raises QueueFull when saturated."""
+        with self._lock:
+            if not self._has_room(size):
+                raise QueueFull(f"{self._pending} jobs ({self._pending_bytes >> 20} MB) already in progress")
+            self._pending += 1
+            self._pending_bytes += size
+            job = Job(uuid.uuid4().hex[:12], label, size, [StageProgress(s.name) for s in self.stages])
+            self._jobs[job.job_id] = job
+            self._trim()
+        self._workers.submit(self._run, job, dict(context))
+        return job.job_id
+
+    def job(self, job_id: str) -> Optional[Job]:
+        """Snapshot of a job, safe to read while the worker keeps updating it."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return copy.deepcopy(job) if job is not None else None
+
+    def jobs(self) -> list:
+        with self._lock:
+            return [copy.deepcopy(j) for j in self._jobs.values()]
+
+    def run_compute(self, fn, *args):
+        """Call `fn(*args)` in the compute pool (inline in thread mode) and wait for the result."""
+        if self._compute is None:
+            return fn(*args)
+        return self._compute.submit(fn, *args).result()
+
+    @property
+    def backlog(self) -> int:
+        return self._pending
+
+    def has_room(self, size: int = 0) -> bool:
+        """Whether `submit` would accept a job of `size` bytes right now."""
+        with self._lock:
+            return self._has_room(size)
+
+    def running_before(self, stage_name: str) -> int:
+        """Jobs on a worker that have not reached stage `stage_name` yet."""
+        index = [s.name for s in self.stages].index(stage_name)
+        with self._lock:
+            return sum(j.status == RUNNING and sum(p.status == DONE for p in j.stages) < index
+                       for j in self._jobs.values())
+
+    def shutdown(self, wait: bool = True):
+        self._workers.shutdown(wait=wait)
+        if self._compute is not None:
+            self._compute.shutdown(wait=wait)
+
+    # ---------- execution ----------
+    def _run(self, job: Job, context: dict):
+        with self._lock:
+            job.status = RUNNING
+        try:
+            for stage, progress in zip(self.stages, job.stages):
+                with self._lock:
+                    progress.status, progress.started_at = RUNNING, time.time()
+                with telemetry.span(f"ingest.{stage.name}"):
+                    if stage.cpu_bound and self._compute is not None:
+                        updates = self._compute.submit(stage.fn, context).result()
+                    else:
+                        updates = stage.fn(context)
+                if updates:
+                    context.update(updates)
+                with self._lock:
+                    progress.status, progress.finished_at = DONE, time.time()
+        except Exception as exc:  # the job records the failure; the worker must survive
+            with self._lock:
+                progress.status, progress.finished_at = FAILED, time.time()
+                job.status, job.error = FAILED, f"{type(exc).__name__}: {exc}"
+        else:
+            with self._lock:
+                job.status = DONE
+                job.result = {k: v for k, v in context.items() if k not in self.private_keys}
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._pending_bytes -= job.size
+
+    def _has_room(self, size: int) -> bool:
+        # A job larger than the byte limit is still accepted when nothing else is pending.
+        return self._pending < self.max_pending and (
+            not self._pending or self._pending_bytes + size <= self.max_pending_bytes)
+
+    def _trim(self):
+        finished = [jid for jid, j in self._jobs.items() if j.finished]
+        for jid in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[jid]
+
@@ -0,0 +1,28 @@
+"""Score fusion for hybrid keyword + semantic retrieval."""
+import numpy as np
+
+SEMANTIC_WEIGHT = 0.5
+# Hashed embeddings of unrelated texts still score around +-0.06 from collisions.
+MIN_SEMANTIC_ONLY = 0.15
+
+
+def hybrid_scores(keyword_hits, semantic: dict, weight: float = SEMANTIC_WEIGHT) -> list:
+    """Blend BM25 and cosine scores into a single 0..1 relevance per document.
+
+    `keyword_hits` is a list of (ordinal, bm25) and `semantic` maps ordinal to
+    cosine similarity for every candidate from either retriever. BM25 is
+    normalized by the best keyword score in the result set so the two scales
+    are comparable; documents missing from the keyword list contribute 0 there.
+    Returns (ordinal, relevance) pairs, best first.
+    """
+    bm25 = dict(keyword_hits)
+    semantic = {o: s for o, s in semantic.items() if o in bm25 or s >= MIN_SEMANTIC_ONLY}
+    top = max(bm25.values(), default=0.0) or 1.0
+    ordinals = list(bm25.keys() | semantic.keys())
+    if not ordinals:
+        return []
+    kw = np.array([bm25.get(o, 0.0) / top for o in ordinals])
+    sem = np.clip(np.array([semantic.get(o, 0.0) for o in ordinals]), 0.0, 1.0)
+    fused = (1 - weight) * kw + weight * sem
+    order = np.lexsort((ordinals, -fused))  # ties broken by ordinal so paging is stable
+    return [(ordinals[i], float(fused[i])) for i in order]
@@ -0,0 +1,140 @@
+"""Related-document graph: the k most similar documents of every document.
+
+Adjacency is two (documents, k) arrays indexed by ordinal: neighbour
+ordinals (-1 for an empty slot) and their cosine similarities, best first.
+Looking up a document's related documents is a row read.
+
+The graph is kept exact as documents arrive, without rebuilding it. A new
+document is compared with every stored embedding in one chunked scan (see
+`VectorStore.scan`). Its own row is the top k of that scan. It also takes
+the place of the weakest neighbour in the row of every document it is more
+similar to than that neighbour. Only documents with positive similarity
+count as related.
+
+The arrays are saved every `save_every` additions and on close, together
+with the number of leading ordinals they fully cover. Embeddings added since
+are caught up through the same `add`, one document at a time, so a crash or
+a first start on existing data never needs an all-pairs rebuild; `Services`
+runs the catch-up on a background thread.
+"""
+import json
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+
+class RelatedGraph:
+    def __init__(self, path, k: int = 10, save_every: int = 1000):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.k = k
+        self.save_every = save_every
+        self._lock = threading.Lock()
+        self._neighbors = np.full((0, k), -1, dtype=np.int32)
+        self._sims = np.zeros((0, k), dtype=np.float32)
+        self.n_rows = 0  # ordinals below this have been added
+        self._ahead = set()  # ordinals added above n_rows, e.g. by ingest during a catch-up
+        self._unsaved = 0
+        self.version = 0
+        self._load()
+
+    # ---------- updates ----------
+    def add(self, ordinal: int, store):
+        """Link a new document whose embedding is already in `store` (a `VectorStore`)."""
+        with self._lock:
+            # The stored (possibly quantized) vector, so both directions of a pair get the same similarity.
+            sims = store.scan(store.vectors([ordinal])[0])
+            if ordinal < sims.size:
+                sims[ordinal] = -np.inf
+            self._ensure_capacity(max(ordinal + 1, sims.size))
+            self._set_row(ordinal, sims)
+            # Reverse edges: documents for which the newcomer beats their current k-th neighbour
+            # (an empty slot has similarity 0, so any positive similarity fills it).
+            n = sims.size
+            for j in np.flatnonzero(sims > self._sims[:n, -1]):
+                self._insert(int(j), ordinal, float(sims[j]))
+            self._ahead.add(ordinal)
+            while self.n_rows in self._ahead:
+                self._ahead.remove(self.n_rows)
+                self.n_rows += 1
+            self.version += 1
+            self._unsaved += 1
+            due = self._unsaved >= self.save_every
+        if due:
+            self.save()
+
+    def catch_up(self, store, stop: threading.Event = None):
+        """Add every embedding in `store` this graph has not seen yet; `stop` interrupts it."""
+        for ordinal in range(self.n_rows, store.n_rows):
+            if stop is not None and stop.is_set():
+                break
+            if ordinal not in self._ahead:
+                self.add(ordinal, store)
+        if self._unsaved:
+            self.save()
+
+    def save(self):
+        with self._lock:
+            tmp = self.path / "related.npz.tmp"
+            with open(tmp, "wb") as f:
+                np.savez(f, neighbors=self._neighbors[:self.n_rows], sims=self._sims[:self.n_rows])
+            os.replace(tmp, self.path / "related.npz")
+            (self.path / "meta.json.tmp").write_text(json.dumps({"n_rows": self.n_rows, "k": self.k}))
+            os.replace(self.path / "meta.json.tmp", self.path / "meta.json")
+            self._unsaved = 0
+
+    # ---------- queries ----------
+    def related(self, ordinal: int, k: int = None) -> list:
+        """(ordinal, similarity) pairs of the most similar documents, best first."""
+        if ordinal >= len(self._neighbors):
+            return []
+        k = self.k if k is None else min(k, self.k)
+        with self._lock:
+            neighbors, sims = self._neighbors[ordinal, :k].tolist(), self._sims[ordinal, :k].tolist()
+        # int8 quantization can push a near-identical pair slightly above 1.
+        return [(o, min(s, 1.0)) for o, s in zip(neighbors, sims) if o >= 0]
+
+    # ---------- internals ----------
+    def _set_row(self, ordinal: int, sims: np.ndarray):
+        k = min(self.k, sims.size)
+        top = np.argpartition(-sims, k - 1)[:k] if sims.size > k else np.arange(sims.size)
+        top = top[np.argsort(-sims[top], kind="stable")]
+        top = top[sims[top] > 0]
+        self._neighbors[ordinal] = -1
+        self._sims[ordinal] = 0
+        self._neighbors[ordinal, :top.size] = top
+        self._sims[ordinal, :top.size] = sims[top]
+
+    def _insert(self, row: int, ordinal: int, sim: float):
+        neighbors, sims = self._neighbors[row], self._sims[row]
+        if ordinal in neighbors:  # already linked, e.g. by a concurrent ingest's scan
+            return
+        pos = int(np.count_nonzero(sims >= sim))
+        neighbors[pos + 1:] = neighbors[pos:-1].copy()
+        sims[pos + 1:] = sims[pos:-1].copy()
+        neighbors[pos], sims[pos] = ordinal, sim
+
+    def _ensure_capacity(self, rows: int):
+        capacity = len(self._neighbors)
+        if rows <= capacity:
+            return
+        capacity = max(rows, 2 * capacity, 1024)
+        neighbors = np.full((capacity, self.k), -1, dtype=np.int32)
+        sims = np.zeros((capacity, self.k), dtype=np.float32)
+        neighbors[:len(self._neighbors)] = self._neighbors
+        sims[:len(self._sims)] = self._sims
+        self._neighbors, self._sims = neighbors, sims
+
+    def _load(self):
+        try:
+            meta = json.loads((self.path / "meta.json").read_text())
+            with np.load(self.path / "related.npz") as data:
+                neighbors, sims = data["neighbors"], data["sims"]
+        except (OSError, ValueError, KeyError):
+            return
+        if meta["k"] != self.k or len(neighbors) != meta["n_rows"]:
+            return  # saved with a different k; catch_up adds every document again
+        self._neighbors, self._sims = neighbors, sims
+        self.n_rows = meta["n_rows"]
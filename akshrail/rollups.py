@@ -0,0 +1,210 @@
+"""Incrementally maintained document counts for the Analytics charts.
+
+Counts are kept per (time bucket, document type, status). Ingest adds one to
+the document's upload-day bucket; a status change moves one count from the
+old status to the new one in that same bucket, so the status chart always
+reflects current statuses. Charts read these aggregates directly: the cost
+depends on the number of buckets, not the number of documents.
+
+Persistence is a snapshot plus an append-only journal of sequence-numbered
+deltas, folded into a new snapshot every `snapshot_every` updates; replay
+skips deltas the snapshot already contains. `compact` rolls day buckets
+older than `keep_days` into month buckets ("YYYY-MM") and remembers its
+cutoff. Every later update for a day before that cutoff (a backdated ingest,
+a status change of an old document) goes to the month bucket, so no day
+bucket reappears below it. Range queries count a month bucket in any range
+that overlaps its month, on the first day of the month inside the range.
+"""
+import json
+import os
+import threading
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+GRANULARITIES = ("day", "week", "month", "year")
+
+
+def day_bucket(when) -> str:
+    return when.strftime("%Y-%m-%d")
+
+
+def _bucket_span(bucket: str) -> tuple:
+    """First and last day a bucket covers."""
+    if len(bucket) == 10:
+        d = date.fromisoformat(bucket)
+        return d, d
+    first = date.fromisoformat(bucket + "-01")
+    return first, (first + timedelta(days=31)).replace(day=1) - timedelta(days=1)
+
+
+def _bucket_date(bucket: str, start: date = None, end: date = None):
+    """Date to count a bucket on within [start, end], or None if it falls outside."""
+    first, last = _bucket_span(bucket)
+    if (start and last < start) or (end and first > end):
+        return None
+    return max(first, start) if start else first
+
+
+def _label(d: date, granularity: str) -> str:
+    if granularity == "day":
+        return d.isoformat()
+    if granularity == "week":
+        return (d - timedelta(days=d.weekday())).isoformat()
+    if granularity == "month":
+        return d.strftime("%Y-%m")
+    if granularity == "year":
+        return str(d.year)
+    raise ValueError(f"granularity must be one of {GRANULARITIES}")
+
+
+class RollupStore:
+    def __init__(self, path, snapshot_every: int = 500, keep_days: int = 400):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.snapshot_every = snapshot_every
+        self.keep_days = keep_days
+        self._lock = threading.Lock()
+        self._counts = defaultdict(int)  # (bucket, doc_type, status) -> count
+        self._journal_len = 0
+        self._seq = 0
+        self._compacted_before = ""  # day buckets before this were folded into months
+        self.version = 0
+        self._load()
+
+    # ---------- updates ----------
+    def record_ingest(self, when: datetime, doc_type: str, status: str):
+        self._apply([(self._bucket(when), doc_type, status, 1)])
+
+    def record_status_change(self, uploaded_at: datetime, doc_type: str, old: str, new: str):
+        if old == new:
+            return
+        bucket = self._bucket(uploaded_at)
+        self._apply([(bucket, doc_type, old, -1), (bucket, doc_type, new, 1)])
+
+    def rebuild(self, documents):
+        """Replace all counts from (uploaded_at, doc_type, status) rows."""
+        with self._lock:
+            self._counts.clear()
+            for uploaded_at, doc_type, status in documents:
+                self._counts[(day_bucket(uploaded_at), doc_type, status)] += 1
+            self._compacted_before = ""
+            self._write_snapshot()
+            self.version += 1
+
+    def compact(self, today: date = None) -> int:
+        """Fold day buckets older than `keep_days` into month buckets; returns buckets removed."""
+        cutoff = day_bucket((today or date.today()) - timedelta(days=self.keep_days))
+        with self._lock:
+            cutoff = max(cutoff, self._compacted_before)
+            old = [key for key in self._counts if len(key[0]) == 10 and key[0] < cutoff]
+            for key in old:
+                bucket, doc_type, status = key
+                self._counts[(bucket[:7], doc_type, status)] += self._counts.pop(key)
+            if old or cutoff != self._compacted_before:
+                self._compacted_before = cutoff
+                self._write_snapshot()
+                self.version += 1
+            return len(old)
+
+    # ---------- queries ----------
+    def series(self, granularity: str = "month", start: date = None, end: date = None,
+               doc_type: str = None, status: str = None) -> dict:
+        """Upload counts per period label within [start, end], oldest first, gaps filled with 0."""
+        totals = defaultdict(int)
+        for (bucket, t, s), n in self._snapshot():
+            if (doc_type and t != doc_type) or (status and s != status):
+                continue
+            d = _bucket_date(bucket, start, end)
+            if d is None:
+                continue
+            totals[_label(d, granularity)] += n
+        if start and end:
+            for label in _labels_between(start, end, granularity):
+                totals.setdefault(label, 0)
+        return dict(sorted(totals.items()))
+
+    def counts_by(self, dimension: str, start: date = None, end: date = None) -> dict:
+        """Totals per "doc_type" or "status" for documents uploaded in [start, end]."""
+        index = {"doc_type": 1, "status": 2}[dimension]
+        totals = defaultdict(int)
+        for key, n in self._snapshot():
+            if _bucket_date(key[0], start, end) is None:
+                continue
+            totals[key[index]] += n
+        return {k: v for k, v in totals.items() if v}
+
+    @property
+    def bucket_count(self) -> int:
+        return len(self._counts)
+
+    def is_empty(self) -> bool:
+        return not self._counts
+
+    # ---------- internals ----------
+    def _snapshot(self):
+        with self._lock:
+            return list(self._counts.items())
+
+    def _bucket(self, when) -> str:
+        """The bucket holding documents uploaded at `when`: its day, or its month once compacted."""
+        bucket = day_bucket(when)
+        return bucket[:7] if bucket < self._compacted_before else bucket
+
+    def _apply(self, deltas):
+        with self._lock:
+            for bucket, doc_type, status, n in deltas:
+                key = (bucket, doc_type, status)
+                self._counts[key] += n
+                if self._counts[key] == 0:
+                    del self._counts[key]
+            with open(self.path / "journal.jsonl", "a", encoding="utf-8") as f:
+                for delta in deltas:
+                    self._seq += 1
+                    f.write(json.dumps([self._seq, *delta]) + "\n")
+            self._journal_len += len(deltas)
+            if self._journal_len >= self.snapshot_every:
+                self._write_snapshot()
+            self.version += 1
+
+    def _write_snapshot(self):
+        rows = [[*key, n] for key, n in self._counts.items()]
+        tmp = self.path / "snapshot.json.tmp"
+        tmp.write_text(json.dumps({"seq": self._seq, "compacted_before": self._compacted_before, "rows": rows}))
+        os.replace(tmp, self.path / "snapshot.json")
+        # The journal only holds deltas newer than the snapshot.
+        open(self.path / "journal.jsonl", "w").close()
+        self._journal_len = 0
+
+    def _load(self):
+        try:
+            snapshot = json.loads((self.path / "snapshot.json").read_text())
+        except (OSError, ValueError):
+            snapshot = {"seq": 0, "rows": []}
+        self._seq = snapshot["seq"]
+        self._compacted_before = snapshot.get("compacted_before", "")
+        for bucket, doc_type, status, n in snapshot["rows"]:
+            self._counts[(bucket, doc_type, status)] = n
+        journal = self.path / "journal.jsonl"
+        if journal.exists():
+            with open(journal, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        seq, bucket, doc_type, status, n = json.loads(line)
+                    except ValueError:
+                        break  # torn final write
+                    if seq <= snapshot["seq"]:
+                        continue
+                    self._counts[(bucket, doc_type, status)] += n
+                    self._seq = seq
+                    self._journal_len += 1
+
+
+def _labels_between(start: date, end: date, granularity: str):
+    labels, d = [], start
+    while d <= end:
+        labels.append(_label(d, granularity))
+        d += timedelta(days=1) if granularity in ("day", "week") else timedelta(days=28)
+    if granularity != "day":
+        labels.append(_label(end, granularity))
+    return labels
@@ -0,0 +1,289 @@
+"""Process-wide services shared by every Streamlit session (and the CLI tools).
+
+The app builds one `Services` per process through `st.cache_resource`; all
+stores here are thread-safe.
+
+The stores keep in-memory state and rewrite their files on flush, so a data
+directory may be open in only one process at a time. `Services` holds an
+exclusive lock on `<data_dir>/.lock`; opening the directory from a second
+process (say, a bulk import while the app runs) raises `DataDirInUse`.
+Within one process, a new `Services` for a directory closes the previous one
+first, which waits for its queued uploads to finish. This happens when `st.cache_resource` is cleared, since the cache drops
+its instance without closing it.
+"""
+import atexit
+import bisect
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from akshrail import bitmaps, config, ingest, telemetry
+from akshrail.activity import ActivityLog
+from akshrail.blobs import BlobStore
+from akshrail.cache import TTLCache
+from akshrail.dedup import DuplicateIndex
+from akshrail.documents import format_doc_id
+from akshrail.extract import decode_text, extension, extract_text
+from akshrail.facets import FacetIndex, facet_values
+from akshrail.heavyhitters import KeywordTracker
+from akshrail.metastore import MetaStore
+from akshrail.pipeline import IngestPipeline, Stage
+from akshrail.ranking import MIN_SEMANTIC_ONLY, hybrid_scores
+from akshrail.related import RelatedGraph
+from akshrail.rollups import RollupStore
+from akshrail.summarize import BatchSummarizer
+from akshrail.textindex import TextIndex
+from akshrail.vectors import DEFAULT_ENCODER, VectorStore
+
+log = logging.getLogger(__name__)
+
+MAX_RESULTS = 200  # depth of the ranked list that paging walks through
+PREVIEW_BYTES = 2048
+
+
+@dataclass
+class SearchPage:
+    hits: list  # (Document, relevance) for this page only
+    total: int
+    start: int  # 0-based position of the first hit in the full result list
+    next_cursor: str = None  # None on the last page
+    facets: dict = None  # {field: {value: hits}} for the facet filters
+
+
+class DataDirInUse(RuntimeError):
+    """Raised by `Services` when another process has the data directory open."""
+
+
+_open = {}  # resolved data dir -> the Services holding it in this process
+
+
+def _lock_data_dir(data_dir: Path):
+    """Open and exclusively lock `<data_dir>/.lock`; the lock lasts until the file is closed."""
+    f = open(data_dir / ".lock", "a+")
+    try:
+        if os.name == "nt":
+            import msvcrt
+
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.seek(0)
+        holder = f.read().strip() or "unknown"
+        f.close()
+        raise DataDirInUse(f"{data_dir} is in use by another process (pid {holder}); stop it and retry") from None
+    f.truncate(0)
+    f.write(str(os.getpid()))
+    f.flush()
+    return f
+
+
+class Services:
+    def __init__(self, data_dir=None, compute: str = "thread", workers: int = 2):
+        self.data_dir = Path(data_dir or config.DATA_DIR)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        key = self.data_dir.resolve()
+        if key in _open:
+            _open[key].close()
+        self._lock_file = _lock_data_dir(self.data_dir)
+        self.metastore = MetaStore(self.data_dir / "metadata.sqlite3")
+        legacy = self.data_dir / "documents.jsonl"
+        if legacy.exists() and not len(self.metastore):
+            self.metastore.import_jsonl(legacy)
+            legacy.rename(legacy.with_suffix(".jsonl.migrated"))
+        self.blobs = BlobStore(self.data_dir / "blobs")
+        self.text_index = TextIndex(self.data_dir / "index")
+        self.vector_store = VectorStore(self.data_dir / "vectors")
+        self.duplicates = DuplicateIndex(self.data_dir / "dedup")
+        self.related_graph = RelatedGraph(self.data_dir / "related")  # caught up in _catch_up
+        self.rollups = RollupStore(self.data_dir / "rollups")
+        if self.rollups.is_empty() and len(self.metastore):
+            self.rollups.rebuild((d.uploaded_at, d.doc_type, d.status) for d in self.metastore.iter_documents())
+        self.rollups.compact()
+        # Fed from the metastore's status history, so it needs no hook in the write paths.
+        self.activity = ActivityLog(self.data_dir / "activity", self.metastore)
+        self.activity.sync()
+        self.facets = FacetIndex(self.data_dir / "facets")
+        if self.facets.stamp != self.metastore.change_seq():
+            self.facets.rebuild(self.metastore.iter_documents(), stamp=self.metastore.change_seq())
+        self.search_cache = TTLCache(maxsize=256, ttl=600)
+        telemetry.register_cache("search results", self.search_cache)
+        self.keywords = KeywordTracker(self.data_dir / "keywords")
+        self.pipeline = IngestPipeline(
+            [
+                Stage("extract", ingest.extract_stage, cpu_bound=True),
+                Stage("summarize", self._summarize_stage),
+                Stage("embed", ingest.embed_stage, cpu_bound=True),
+                Stage("fingerprint", ingest.fingerprint_stage, cpu_bound=True),
+                Stage("index", self._index_stage),
+            ],
+            max_workers=workers,
+            compute=compute,
+            private_keys=("text", "embedding", "minhash"),
+        )
+        # Uploads in flight together are summarized as one batch in the compute pool; a miss
+        # waits for company only while other uploads are still being extracted.
+        self.summarizer = BatchSummarizer(self.metastore, run=self.pipeline.run_compute,
+                                          expected=lambda: self.pipeline.running_before("summarize"))
+        telemetry.register_cache("summaries", self.summarizer)
+        _open[key] = self
+        self._closed = threading.Event()
+        self._catch_up_thread = threading.Thread(target=self._catch_up, name="catch-up", daemon=True)
+        self._catch_up_thread.start()
+        atexit.register(self.close)
+
+    def submit_upload(self, source, filename: str, title: str, doc_type: str, uploaded_at: datetime = None) -> str:
+        """Store an uploaded file (bytes or a binary file object), queue it for processing and return the job id.
+
+        `uploaded_at` backdates the document (e.g. to the file's mtime on a bulk import); default now.
+        """
+        content_hash, size = self.blobs.put(source)
+        ctx = {"blob": str(self.blobs.object_path(content_hash)), "content_hash": content_hash,
+               "filename": filename, "title": title or filename, "doc_type": doc_type, "uploaded_at": uploaded_at}
+        return self.pipeline.submit(ctx, label=filename, size=size)
+
+    @telemetry.timed("search.page")
+    def search_page(self, query: str, filters: dict = None, cursor: str = None, page_size: int = 10) -> SearchPage:
+        """One page of results; pass the previous page's `next_cursor` to continue.
+
+        `filters` maps facet fields ("doc_type", "status", "month") to the
+        allowed values. The ranked list and facet counts are cached per
+        (normalized query, filters, index versions), so paging and reruns only
+        fetch the page's documents.
+        """
+        ranked, facets = self._ranked(query, filters)
+        start = 0
+        if cursor:
+            score, ordinal = cursor.split(":")
+            # Keyset cursor: resume after the last hit shown, even if the list
+            # has been recomputed since.
+            start = bisect.bisect_right(ranked, (-float(score), int(ordinal)), key=lambda h: (-h[1], h[0]))
+        page = ranked[start:start + page_size]
+        docs = self.metastore.get_many(o for o, _ in page)
+        hits = [(docs[o], score) for o, score in page if o in docs]
+        next_cursor = None
+        if start + page_size < len(ranked):
+            last_ordinal, last_score = page[-1]
+            next_cursor = f"{last_score!r}:{last_ordinal}"
+        return SearchPage(hits, len(ranked), start, next_cursor, facets)
+
+    def preview(self, doc, max_bytes: int = PREVIEW_BYTES) -> str:
+        """The opening text of a plain-text document, read from the head of its blob; "" for other formats."""
+        if not doc.content_hash or extension(doc.filename) != "txt":
+            return ""
+        head = self.blobs.read_range(doc.content_hash, 0, max_bytes)
+        return decode_text(head, complete=len(head) < max_bytes)
+
+    def related(self, ordinal: int, k: int = 5) -> list:
+        """(Document, similarity) pairs of the documents most similar to this one, best first."""
+        links = self.related_graph.related(ordinal, k)
+        docs = self.metastore.get_many(o for o, _ in links)
+        return [(docs[o], sim) for o, sim in links if o in docs]
+
+    def set_status(self, ordinal: int, status: str):
+        """Move a document to a new review status, keeping every aggregate in step."""
+        before = self.metastore.set_status(ordinal, status)
+        self.rollups.record_status_change(before.uploaded_at, before.doc_type, before.status, status)
+        self.facets.move(ordinal, "status", before.status, status)
+
+    def close(self):
+        if self._lock_file.closed:
+            return
+        atexit.unregister(self.close)
+        self._closed.set()
+        # Queued uploads finish while the stores are still open, so none is lost or half-indexed.
+        self.pipeline.shutdown(wait=True)
+        self._catch_up_thread.join(timeout=10)
+        self.text_index.close()
+        self.vector_store.flush()
+        self.duplicates.flush()
+        self.related_graph.save()
+        self.facets.save(stamp=self.metastore.change_seq())
+        self.keywords.flush()
+        telemetry.REGISTRY.export(self.data_dir / "telemetry.json")
+        if _open.get(self.data_dir.resolve()) is self:
+            del _open[self.data_dir.resolve()]
+        self._lock_file.close()
+
+    def _ranked(self, query: str, filters: dict = None) -> tuple:
+        """(ranked [(ordinal, relevance)], facet counts), cached."""
+        filters = {f: tuple(sorted(v)) for f, v in (filters or {}).items() if v}
+        key = (" ".join(query.lower().split()), tuple(sorted(filters.items())),
+               self.text_index.version, self.vector_store.n_rows, self.facets.version)
+
+        @telemetry.timed("search.rank")
+        def compute():
+            # The filter bitmap goes into both retrievers, so excluded documents are never scored.
+            allow = self.facets.mask(filters)
+            keyword, matched = self.text_index.search_matches(query, MAX_RESULTS, allow)
+            query_vec = DEFAULT_ENCODER.encode(query)
+            semantic = dict(self.vector_store.search(query_vec, MAX_RESULTS, allow))
+            # Facets count over the unfiltered candidates: every keyword match plus the
+            # semantic-only hits of an unfiltered search, so an option's count does not
+            # depend on which other options of its field are selected.
+            unfiltered = semantic if allow is None else dict(self.vector_store.search(query_vec, MAX_RESULTS))
+            semantic_only = [o for o, sim in unfiltered.items() if sim >= MIN_SEMANTIC_ONLY]
+            matched = bitmaps.from_ordinals(np.union1d(matched, semantic_only).astype(np.int64))
+            missing = [o for o, _ in keyword if o not in semantic]
+            semantic.update(zip(missing, self.vector_store.scores(query_vec, missing).tolist()))
+            ranked = hybrid_scores(keyword, semantic)[:MAX_RESULTS]
+            return ranked, self.facets.counts(matched, filters)
+
+        return self.search_cache.get_or_compute(key, compute)
+
+    def _catch_up(self):
+        """Bring the derived indexes up to the metastore, off the startup path.
+
+        The text index and vector store buffer recent writes (see
+        `TextIndex.flush`, `VectorStore.flush`), so an unclean exit can drop
+        the last documents; their text is extracted again from the blob store.
+        Then the related graph adds the embeddings it has not seen.
+        """
+        try:
+            n = len(self.metastore)
+            unindexed = self.text_index.missing(n)
+            lost = np.union1d(unindexed, np.arange(self.vector_store.n_rows, n))
+            if lost.size:
+                log.info("Reindexing %d documents lost from the text index or vector store", lost.size)
+            unindexed = set(unindexed.tolist())
+            for ordinal in lost.tolist():
+                if self._closed.is_set():
+                    return
+                doc = self.metastore.get(ordinal)
+                text = ""
+                if doc.content_hash:  # documents migrated from documents.jsonl have no blob
+                    try:
+                        text = extract_text(self.blobs.object_path(doc.content_hash), doc.filename)
+                    except Exception:  # index what we have; the document stays findable by title
+                        log.exception("Could not re-extract %s", doc.doc_id)
+                if ordinal in unindexed:
+                    self.text_index.add(ordinal, f"{doc.doc_id} {doc.title} {text}")
+                if ordinal >= self.vector_store.n_rows or not self.vector_store.vectors([ordinal]).any():
+                    self.vector_store.put(ordinal, DEFAULT_ENCODER.encode(f"{doc.title} {text}"))
+            self.related_graph.catch_up(self.vector_store, stop=self._closed)
+        except Exception:
+            log.exception("Catch-up at open failed; it is retried at the next start")
+
+    def _summarize_stage(self, ctx: dict) -> dict:
+        return {"summary": self.summarizer.summarize(ctx["content_hash"], ctx.get("text", ""))}
+
+    def _index_stage(self, ctx: dict) -> dict:
+        doc = self.metastore.add(ctx["title"], ctx["doc_type"], ctx["filename"], ctx.get("summary", ""),
+                                 ctx["content_hash"], uploaded_at=ctx.get("uploaded_at"))
+        self.facets.add(doc.ordinal, facet_values(doc))  # before the retrievers can return it
+        self.text_index.add(doc.ordinal, f"{doc.doc_id} {doc.title} {ctx.get('text', '')}")
+        self.vector_store.put(doc.ordinal, ctx["embedding"])
+        self.related_graph.add(doc.ordinal, self.vector_store)
+        found = self.duplicates.add(doc.ordinal, ctx["content_hash"], ctx["minhash"])
+        self.rollups.record_ingest(doc.uploaded_at, doc.doc_type, doc.status)
+        exact = format_doc_id(found["exact"]) if found["exact"] is not None else None
+        near = [(format_doc_id(o), round(j, 2)) for o, j in found["near"]]
+        return {"doc_id": doc.doc_id, "ordinal": doc.ordinal, "exact_duplicate_of": exact, "near_duplicates": near}
@@ -0,0 +1,177 @@
+"""Extractive summaries: the most central sentences of a document (TextRank).
+
+Sentences are TF-IDF vectors (IDF taken over the document's own sentences),
+the sentence graph is weighted by cosine similarity, and PageRank over that
+graph ranks the sentences; the top few are returned in reading order.
+
+`summarize_batch` handles many documents at once: one sparse (row, term,
+weight) pass computes every sentence vector in the batch, and PageRank runs
+on all documents' graphs together as a padded (docs, sentences, sentences)
+array. `BatchSummarizer` gathers concurrent ingest requests into such
+batches and keeps every result keyed by content hash, so re-uploads and
+reruns never summarize the same content twice.
+"""
+import re
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from akshrail.text import tokenize
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def split_sentences(text: str) -> list:
+    return [s for s in _SENTENCE_END.split(" ".join(text.split())) if s]
+
+
+def _clip(summary: str, max_chars: int) -> str:
+    if len(summary) > max_chars:
+        summary = summary[:max_chars - 3].rstrip() + "..."
+    return summary
+
+
+def summarize_batch(texts, n_sentences: int = 2, max_chars: int = 300, max_sentences: int = 200,
+                    damping: float = 0.85, iterations: int = 50) -> list:
+    """A summary for each text; texts of up to `n_sentences` sentences are kept whole."""
+    split = [split_sentences(t)[:max_sentences] for t in texts]
+    out = [_clip(" ".join(s), max_chars) for s in split]
+    ranked = [i for i, s in enumerate(split) if len(s) > n_sentences]
+    if ranked:
+        scores = textrank([split[i] for i in ranked], damping, iterations)
+        for i, score in zip(ranked, scores):
+            top = np.sort(np.argsort(-score, kind="stable")[:n_sentences])  # ties go to the earlier sentence
+            out[i] = _clip(" ".join(split[i][j] for j in top), max_chars)
+    return out
+
+
+def summarize(text: str, **kwargs) -> str:
+    return summarize_batch([text], **kwargs)[0]
+
+
+# ---------- TextRank ----------
+def textrank(docs, damping: float = 0.85, iterations: int = 50, tol: float = 1e-6) -> list:
+    """PageRank score of every sentence, one array per document (a list of sentence lists)."""
+    lengths = np.array([len(s) for s in docs])
+    sim = _similarity(docs, lengths)
+    live = np.arange(sim.shape[1])[None, :] < lengths[:, None]  # (docs, S): real, not padding
+    uniform = live / lengths[:, None]
+    out_weight = sim.sum(axis=2, keepdims=True)
+    # Row-stochastic transitions; a sentence sharing no terms with the others links to all of them.
+    trans = np.where(out_weight > 0, sim / np.where(out_weight > 0, out_weight, 1), uniform[:, None, :])
+    trans *= live[:, :, None]
+    score, active = uniform, np.ones(len(docs), dtype=bool)
+    for _ in range(iterations):
+        updated = (1 - damping) * uniform + damping * np.einsum("bi,bij->bj", score, trans)
+        # Documents stop at their own convergence, so a result does not depend on its batch.
+        delta = np.abs(updated - score).max(axis=1)
+        score = np.where(active[:, None], updated, score)
+        active &= delta >= tol
+        if not active.any():
+            break
+    return [score[b, :n] for b, n in enumerate(lengths)]
+
+
+def _similarity(docs, lengths: np.ndarray) -> np.ndarray:
+    """(docs, S, S) cosine similarity between the sentences of each document, zero-padded."""
+    vocab, rows, cols, row = {}, [], [], 0
+    for sentences in docs:
+        for sentence in sentences:
+            for token in tokenize(sentence):
+                rows.append(row)
+                cols.append(vocab.setdefault(token, len(vocab)))
+            row += 1
+    v = max(len(vocab), 1)
+    first = np.concatenate([[0], np.cumsum(lengths)])  # first row of each document
+    row_doc = np.repeat(np.arange(len(docs)), lengths)
+
+    # Sparse TF-IDF: one entry per distinct (sentence, term), sorted by sentence.
+    pairs, tf = np.unique(np.asarray(rows, dtype=np.int64) * v + np.asarray(cols, dtype=np.int64),
+                          return_counts=True)
+    r, c = pairs // v, pairs % v
+    _, doc_term, df = np.unique(row_doc[r] * v + c, return_inverse=True, return_counts=True)
+    n = lengths[row_doc[r]]
+    w = (1 + np.log(tf)) * (np.log((1 + n) / (1 + df[doc_term])) + 1)
+    w /= np.sqrt(np.bincount(r, weights=w * w, minlength=row))[r]
+
+    size = int(lengths.max())
+    sim = np.zeros((len(docs), size, size), dtype=np.float32)
+    bounds = np.searchsorted(r, first)
+    for b, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:])):
+        # Densify over this document's own terms only; the product is sentences x sentences.
+        terms, local_col = np.unique(c[lo:hi], return_inverse=True)
+        x = np.zeros((lengths[b], len(terms)), dtype=np.float32)
+        x[r[lo:hi] - first[b], local_col] = w[lo:hi]
+        sim[b, :lengths[b], :lengths[b]] = x @ x.T
+    diagonal = np.arange(size)
+    sim[:, diagonal, diagonal] = 0
+    return sim
+
+
+# ---------- ingest-time batching ----------
+class BatchSummarizer:
+    """Summaries by content hash, computing concurrent misses together.
+
+    `store` provides `summaries(hashes) -> {hash: summary}` and
+    `put_summaries({hash: summary})` (see `MetaStore`). `run(fn, texts)` runs
+    a batch, e.g. in a process pool; by default it is called inline. The
+    first miss waits up to `max_wait` seconds for others to join its batch,
+    but only while `expected()` (default: always 1) says more calls are on
+    their way, e.g. uploads still in an earlier pipeline stage.
+    """
+
+    def __init__(self, store, run=None, max_batch: int = 32, max_wait: float = 0.05, expected=None):
+        self.store = store
+        self._run = run or (lambda fn, texts: fn(texts))
+        self._expected = expected or (lambda: 1)
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._queue = []  # (content_hash, text) waiting for the next batch
+        self._inflight = {}  # content_hash -> Future, so identical uploads share one result
+        self.hits = 0
+        self.misses = 0
+
+    def summarize(self, content_hash: str, text: str) -> str:
+        cached = self.store.summaries([content_hash]).get(content_hash)
+        with self._lock:
+            if cached is not None:
+                self.hits += 1
+                return cached
+            self.misses += 1
+            future = self._inflight.get(content_hash)
+            leader = future is None and not self._queue
+            if future is None:
+                future = self._inflight[content_hash] = Future()
+                self._queue.append((content_hash, text))
+            full = len(self._queue) >= self.max_batch
+        if leader and not full:
+            deadline = time.monotonic() + self.max_wait
+            while (time.monotonic() < deadline and self._expected() > 0
+                   and len(self._queue) < self.max_batch):
+                time.sleep(0.005)
+        if leader or full:
+            self._flush()
+        return future.result()
+
+    def _flush(self):
+        with self._lock:
+            batch, self._queue = self._queue[:self.max_batch], self._queue[self.max_batch:]
+        if not batch:
+            return
+        hashes = [h for h, _ in batch]
+        try:
+            summaries = dict(zip(hashes, self._run(summarize_batch, [t for _, t in batch])))
+            self.store.put_summaries(summaries)
+        except Exception as exc:  # every waiter gets the error; the next upload retries
+            with self._lock:
+                futures = [self._inflight.pop(h) for h in hashes]
+            for future in futures:
+                future.set_exception(exc)
+            return
+        with self._lock:
+            futures = [self._inflight.pop(h) for h in hashes]
+        for future, h in zip(futures, hashes):
+            future.set_result(summaries[h])
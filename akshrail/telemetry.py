@@ -0,0 +1,227 @@
+"""Latency histograms for the app's hot paths.
+
+    with telemetry.span("search.rank"):
+        ...
+
+Each span adds its duration to the histogram of its section. A histogram
+has log-linear buckets (8 per power of two, so a bucket is at most 12.5%
+wide) from 1 microsecond to over four hours. Threads are spread round-robin
+over a fixed set of lock-striped shards, so recording rarely contends and
+memory stays bounded however many threads Streamlit starts. Readers merge
+the shards. Call rates come from a per-second ring covering the last minute.
+
+Caches report their hit ratios through `register_cache`. `snapshot()`
+returns everything as plain data for the Dashboard's System Health panel,
+and `export()` writes it as JSON for offline analysis. Set
+AKSHRAIL_TELEMETRY=0 to turn spans into no-ops (see `akshrail.config`).
+"""
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+import weakref
+from datetime import datetime
+
+from akshrail import config
+
+N_BUCKETS = 256
+RATE_WINDOW = 60  # seconds covered by the call-rate ring
+N_SHARDS = 16  # lock stripes per histogram
+
+
+def bucket_of(us: int) -> int:
+    """Bucket index of a duration in microseconds (exact below 16 us, 3 significant bits above)."""
+    if us < 16:
+        return max(us, 0)
+    shift = us.bit_length() - 4
+    return min((shift << 3) + (us >> shift), N_BUCKETS - 1)
+
+
+def bucket_floor(index: int) -> int:
+    """Smallest duration (us) that falls in bucket `index`."""
+    if index < 16:
+        return index
+    shift = (index >> 3) - 1
+    return ((index & 7) + 8) << shift
+
+
+class _Shard:
+    __slots__ = ("lock", "counts", "total_us", "max_us", "seconds", "per_second")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = [0] * N_BUCKETS
+        self.total_us = 0
+        self.max_us = 0
+        self.seconds = [0] * RATE_WINDOW  # which second each slot currently counts
+        self.per_second = [0] * RATE_WINDOW
+
+
+_stripes = threading.local()  # this thread's shard number
+_next_stripe = itertools.count()  # next() is atomic under the GIL
+
+
+def _stripe() -> int:
+    try:
+        return _stripes.number
+    except AttributeError:
+        _stripes.number = next(_next_stripe) % N_SHARDS
+        return _stripes.number
+
+
+class Histogram:
+    """One section's latencies, striped over `N_SHARDS` locked shards."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._shards = [_Shard() for _ in range(N_SHARDS)]
+
+    def record(self, seconds: float, now: float):
+        """Add one call of `seconds` that ended at `now` (a `time.perf_counter()` reading)."""
+        shard = self._shards[_stripe()]
+        us = int(seconds * 1e6)
+        second = int(now)
+        slot = second % RATE_WINDOW
+        with shard.lock:
+            shard.counts[bucket_of(us) if us >= 16 else us] += 1
+            shard.total_us += us
+            if us > shard.max_us:
+                shard.max_us = us
+            if shard.seconds[slot] != second:
+                shard.seconds[slot], shard.per_second[slot] = second, 0
+            shard.per_second[slot] += 1
+
+    def summary(self, now: float = None) -> dict:
+        now = int(now if now is not None else time.perf_counter())
+        counts, total_us, max_us, recent = [0] * N_BUCKETS, 0, 0, 0
+        for s in self._shards:
+            with s.lock:
+                counts = [a + b for a, b in zip(counts, s.counts)]
+                total_us += s.total_us
+                max_us = max(max_us, s.max_us)
+                recent += sum(n for sec, n in zip(s.seconds, s.per_second) if now - RATE_WINDOW < sec <= now)
+        calls = sum(counts)
+        max_ms = max_us / 1000
+        return {
+            "calls": calls,
+            "per_min": recent * 60 / RATE_WINDOW,
+            "mean_ms": total_us / calls / 1000 if calls else 0.0,
+            "p50_ms": min(_quantile(counts, calls, 0.50), max_ms),
+            "p95_ms": min(_quantile(counts, calls, 0.95), max_ms),
+            "p99_ms": min(_quantile(counts, calls, 0.99), max_ms),
+            "max_ms": max_ms,
+            "buckets": {bucket_floor(i): n for i, n in enumerate(counts) if n},
+        }
+
+
+def _quantile(counts: list, calls: int, q: float) -> float:
+    """Upper edge (ms) of the bucket holding the q-quantile; an estimate within one bucket."""
+    if not calls:
+        return 0.0
+    rank, seen = q * calls, 0
+    for i, n in enumerate(counts):
+        seen += n
+        if seen >= rank:
+            return bucket_floor(i + 1) / 1000
+    return bucket_floor(N_BUCKETS) / 1000
+
+
+class _Span:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        self.histogram.record(end - self.start, end)
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class Telemetry:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.started_at = datetime.now()
+        self._histograms = {}
+        self._caches = {}  # name -> weakref to an object with `hits` and `misses`
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str) -> Histogram:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, Histogram(name))
+        return histogram
+
+    def span(self, name: str):
+        """Context manager timing its block into section `name`."""
+        if not self.enabled:
+            return _NO_SPAN
+        return _Span(self.histogram(name))
+
+    def timed(self, name: str):
+        """Decorator form of `span`."""
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def register_cache(self, name: str, cache):
+        """Report `cache.hits` / `cache.misses` under `name`; a later registration replaces it."""
+        with self._lock:
+            self._caches[name] = weakref.ref(cache)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            histograms = dict(self._histograms)
+            caches = {name: ref() for name, ref in self._caches.items()}
+        cache_stats = {}
+        for name, cache in caches.items():
+            if cache is None:
+                continue
+            hits, misses = cache.hits, cache.misses
+            cache_stats[name] = {"hits": hits, "misses": misses,
+                                 "hit_ratio": hits / (hits + misses) if hits + misses else None}
+        return {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "taken_at": datetime.now().isoformat(timespec="seconds"),
+            "sections": {name: histograms[name].summary() for name in sorted(histograms)},
+            "caches": cache_stats,
+        }
+
+    def export(self, path) -> str:
+        """Write the snapshot as JSON to `path` (atomically) and return the JSON."""
+        text = json.dumps(self.snapshot(), indent=2)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+        return text
+
+
+REGISTRY = Telemetry(enabled=config.TELEMETRY)
+span = REGISTRY.span
+timed = REGISTRY.timed
+register_cache = REGISTRY.register_cache
@@ -0,0 +1,14 @@
+"""Tokenization shared by the search index and the other text features."""
+import re
+
+# \w misses Malayalam vowel signs (combining marks), so include the whole block.
+_TOKEN = re.compile(r"(?:[^\W_]|[\u0d00-\u0d7f])+")
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the this to was were will with
+""".split())
+
+
+def tokenize(text: str, stopwords=STOPWORDS) -> list:
+    """Lower-cased word tokens with stopwords removed."""
+    return [t for t in _TOKEN.findall(text.lower()) if t not in stopwords]
@@ -0,0 +1,437 @@
+"""Embedded full-text engine: BM25 over immutable, memory-mapped segments.
+
+Layout on disk::
+
+    <index>/manifest.json          live segment list, swapped atomically
+    <index>/seg_000042/
+        meta.json                  doc count and total token count
+        ordinals.npy, doclen.npy   document ordinals (sorted) and lengths
+        terms.bin, terms_off.npy   sorted lexicon and byte offsets into it
+        post_off.npy, df.npy       per-term postings offsets and doc freqs
+        postings.bin               per term: varint doc-ordinal gaps, then varint tfs
+
+New documents go to an in-memory buffer that is searchable immediately and
+flushed into a segment by a background thread. The same thread merges
+segments of similar size so the segment count stays logarithmic. Only the
+lexicon offsets and per-document arrays are touched at open time, all through
+mmap, so opening a large index costs almost nothing.
+"""
+import heapq
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import numpy as np
+
+from akshrail import bitmaps
+from akshrail.text import tokenize
+
+log = logging.getLogger(__name__)
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+# ---------- varint codec ----------
+def encode_varints(values: np.ndarray, return_lengths: bool = False):
+    """LEB128-encode non-negative integers, vectorized.
+
+    With `return_lengths` also returns the encoded size of every value, which
+    lets callers encode many postings lists in one call and split afterwards.
+    """
+    v = np.asarray(values, dtype=np.uint64)
+    if v.size == 0:
+        return (b"", np.zeros(0, dtype=np.int64)) if return_lengths else b""
+    nbytes = np.ones(v.size, dtype=np.int64)
+    rest = v >> np.uint64(7)
+    while rest.any():
+        nbytes += rest > 0
+        rest >>= np.uint64(7)
+    owner = np.repeat(np.arange(v.size), nbytes)
+    pos = np.arange(owner.size) - np.repeat(np.cumsum(nbytes) - nbytes, nbytes)
+    out = (v[owner] >> (np.uint64(7) * pos.astype(np.uint64))) & np.uint64(0x7F)
+    out |= (pos < nbytes[owner] - 1).astype(np.uint64) << np.uint64(7)
+    data = out.astype(np.uint8).tobytes()
+    return (data, nbytes) if return_lengths else data
+
+
+def decode_varints(buf) -> np.ndarray:
+    b = np.frombuffer(buf, dtype=np.uint8)
+    if b.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    ends = np.flatnonzero(b < 0x80)
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    pos = np.arange(b.size) - np.repeat(starts, ends - starts + 1)
+    parts = (b & 0x7F).astype(np.int64) << (7 * pos)
+    return np.add.reduceat(parts, starts)
+
+
+# ---------- segments ----------
+class Segment:
+    """Read-only view over one segment directory."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.name = self.path.name
+        meta = json.loads((self.path / "meta.json").read_text())
+        self.n_docs = meta["n_docs"]
+        self.total_len = meta["total_len"]
+        self.ordinals = np.load(self.path / "ordinals.npy", mmap_mode="r")
+        self.doclen = np.load(self.path / "doclen.npy", mmap_mode="r")
+        self.terms_off = np.load(self.path / "terms_off.npy", mmap_mode="r")
+        self.post_off = np.load(self.path / "post_off.npy", mmap_mode="r")
+        self.df = np.load(self.path / "df.npy", mmap_mode="r")
+        self.terms = _mmap_bytes(self.path / "terms.bin")
+        self.postings_buf = _mmap_bytes(self.path / "postings.bin")
+        self.n_terms = len(self.df)
+
+    def term(self, i: int) -> bytes:
+        return bytes(self.terms[int(self.terms_off[i]):int(self.terms_off[i + 1])])
+
+    def lookup(self, term: str):
+        """Binary search the lexicon; returns the term number or None."""
+        key = term.encode()
+        lo, hi = 0, self.n_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.term(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.n_terms and self.term(lo) == key:
+            return lo
+        return None
+
+    def postings(self, i: int):
+        """(ordinals, term frequencies) for term number `i`."""
+        raw = self.postings_buf[int(self.post_off[i]):int(self.post_off[i + 1])]
+        values = decode_varints(raw)
+        df = int(self.df[i])
+        return np.cumsum(values[:df]), values[df:]
+
+    def all_postings(self):
+        """Decode every postings list at once: yields (term, ordinals, tfs)."""
+        values = decode_varints(self.postings_buf)
+        bounds = np.zeros(self.n_terms + 1, dtype=np.int64)
+        bounds[1:] = np.cumsum(2 * np.asarray(self.df, dtype=np.int64))
+        for i in range(self.n_terms):
+            lo, df = bounds[i], int(self.df[i])
+            yield self.term(i).decode(), np.cumsum(values[lo:lo + df]), values[lo + df:lo + 2 * df]
+
+    def local(self, ords: np.ndarray) -> np.ndarray:
+        """Positions of `ords` within this segment's ordinal array."""
+        first = int(self.ordinals[0])
+        if int(self.ordinals[-1]) - first + 1 == self.n_docs:
+            return ords - first  # dense segment, the common case
+        return np.searchsorted(self.ordinals, ords)
+
+
+def _mmap_bytes(path: Path):
+    if path.stat().st_size == 0:
+        return b""
+    return memoryview(np.memmap(path, dtype=np.uint8, mode="r")).cast("B")
+
+
+def write_segment(path: Path, postings: dict, ordinals: np.ndarray, doclen: np.ndarray):
+    """Write a segment atomically. `postings` maps term -> (sorted ordinals, tfs)."""
+    tmp = path.with_name(path.name + ".tmp")
+    if tmp.exists():
+        shutil.rmtree(tmp)
+    tmp.mkdir(parents=True)
+    terms = sorted(postings)
+    encoded_terms = [t.encode() for t in terms]
+    terms_off = np.zeros(len(terms) + 1, dtype=np.uint64)
+    terms_off[1:] = np.cumsum([len(t) for t in encoded_terms])
+    df = np.array([len(postings[t][0]) for t in terms], dtype=np.uint32)
+    post_off = np.zeros(len(terms) + 1, dtype=np.uint64)
+    data = b""
+    if terms:
+        # Lay every list out as [gaps..., tfs...] in one array and encode it in a single call.
+        all_ords = np.concatenate([postings[t][0] for t in terms]).astype(np.int64)
+        all_tfs = np.concatenate([postings[t][1] for t in terms]).astype(np.int64)
+        counts = df.astype(np.int64)
+        starts = np.cumsum(counts) - counts
+        owner = np.repeat(np.arange(len(terms)), counts)
+        prev = np.empty_like(all_ords)
+        prev[0] = 0
+        prev[1:] = all_ords[:-1]
+        prev[starts] = 0
+        values = np.empty(2 * all_ords.size, dtype=np.int64)
+        slot = np.arange(all_ords.size) + starts[owner]
+        values[slot] = all_ords - prev
+        values[slot + counts[owner]] = all_tfs
+        data, nbytes = encode_varints(values, return_lengths=True)
+        post_off[1:] = np.cumsum(np.add.reduceat(nbytes, 2 * starts))
+    with open(tmp / "postings.bin", "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    (tmp / "terms.bin").write_bytes(b"".join(encoded_terms))
+    np.save(tmp / "terms_off.npy", terms_off)
+    np.save(tmp / "post_off.npy", post_off)
+    np.save(tmp / "df.npy", df)
+    np.save(tmp / "ordinals.npy", np.asarray(ordinals, dtype=np.int64))
+    np.save(tmp / "doclen.npy", np.asarray(doclen, dtype=np.uint32))
+    meta = {"n_docs": int(len(ordinals)), "total_len": int(np.sum(doclen, dtype=np.int64))}
+    (tmp / "meta.json").write_text(json.dumps(meta))
+    os.replace(tmp, path)
+
+
+# ---------- index ----------
+class TextIndex:
+    """Thread-safe BM25 index: one writer, any number of concurrent searchers."""
+
+    def __init__(self, path, flush_docs: int = 1000, flush_interval: float = 5.0,
+                 merge_factor: int = 8, background: bool = True):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.flush_docs = flush_docs
+        self.flush_interval = flush_interval
+        self.merge_factor = merge_factor
+        self._lock = threading.RLock()
+        self._merge_lock = threading.Lock()
+        manifest = self._read_manifest()
+        self._next_seg = manifest.get("next_segment", 0)
+        self._segments = [Segment(self.path / name) for name in manifest.get("segments", [])]
+        self._remove_orphans(manifest.get("segments", []))
+        self._reset_buffer()
+        self.version = 0  # bumped on every visible change; result caches key on it
+        self._closed = threading.Event()
+        self._thread = None
+        if background:
+            self._thread = threading.Thread(target=self._maintain, name="textindex", daemon=True)
+            self._thread.start()
+
+    # ---------- writing ----------
+    def add(self, ordinal: int, text: str):
+        counts = Counter(tokenize(text))
+        with self._lock:
+            for term, tf in counts.items():
+                self._buf_postings[term].append((ordinal, tf))
+            self._buf_doclen[ordinal] = sum(counts.values())
+            if self._buf_since is None:
+                self._buf_since = time.time()
+            self.version += 1
+            if len(self._buf_doclen) >= self.flush_docs:
+                self.flush()
+
+    def flush(self):
+        """Write the in-memory buffer out as a new segment."""
+        with self._lock:
+            if not self._buf_doclen:
+                return
+            ordinals = np.array(sorted(self._buf_doclen), dtype=np.int64)
+            doclen = np.array([self._buf_doclen[o] for o in ordinals], dtype=np.uint32)
+            postings = {}
+            for term, plist in self._buf_postings.items():
+                arr = np.array(sorted(plist), dtype=np.int64)
+                postings[term] = (arr[:, 0], arr[:, 1])
+            seg_path = self._new_segment_path()
+            write_segment(seg_path, postings, ordinals, doclen)
+            self._commit(self._segments + [Segment(seg_path)])
+            self._reset_buffer()
+
+    def merge(self, force: bool = False):
+        """Merge one tier of similarly sized segments (or everything when forced)."""
+        with self._merge_lock:
+            group = self._segments if force else self._pick_merge()
+            if len(group) < 2:
+                return False
+            postings = defaultdict(lambda: ([], []))
+            for seg in group:
+                for term, ords, tfs in seg.all_postings():
+                    postings[term][0].append(ords)
+                    postings[term][1].append(tfs)
+            merged = {}
+            for term, (ords, tfs) in postings.items():
+                ords, tfs = np.concatenate(ords), np.concatenate(tfs)
+                order = np.argsort(ords, kind="stable")
+                merged[term] = (ords[order], tfs[order])
+            ordinals = np.concatenate([s.ordinals for s in group])
+            doclen = np.concatenate([s.doclen for s in group])
+            order = np.argsort(ordinals, kind="stable")
+            seg_path = self._new_segment_path()
+            write_segment(seg_path, merged, ordinals[order], doclen[order])
+            with self._lock:
+                names = {s.name for s in group}
+                kept = [s for s in self._segments if s.name not in names]
+                self._commit(kept + [Segment(seg_path)], drop=group)
+            return True
+
+    def close(self):
+        self._closed.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+        self.flush()
+
+    # ---------- reading ----------
+    @property
+    def n_docs(self) -> int:
+        return sum(s.n_docs for s in self._segments) + len(self._buf_doclen)
+
+    def missing(self, n: int) -> np.ndarray:
+        """Ordinals below `n` in no segment and not buffered, e.g. lost in an unclean exit."""
+        with self._lock:
+            covered = [np.asarray(s.ordinals, dtype=np.int64) for s in self._segments]
+            covered.append(np.fromiter(self._buf_doclen, dtype=np.int64, count=len(self._buf_doclen)))
+        return np.setdiff1d(np.arange(n, dtype=np.int64), np.concatenate(covered))
+
+    @property
+    def segment_count(self) -> int:
+        return len(self._segments)
+
+    def search(self, query: str, k: int = 10, allow: np.ndarray = None):
+        """Top-k (ordinal, score) pairs by BM25, best first.
+
+        `allow` is an optional bitmap (see `akshrail.bitmaps`); postings outside
+        it are dropped before scoring.
+        """
+        return self.search_matches(query, k, allow)[0]
+
+    def search_matches(self, query: str, k: int = 10, allow: np.ndarray = None):
+        """Like `search`, plus the sorted ordinals of every document matching
+        any query term, ignoring `allow` (used for facet counts)."""
+        terms = Counter(tokenize(query))
+        if not terms:
+            return [], np.zeros(0, dtype=np.int64)
+        with self._lock:
+            segments = list(self._segments)
+            buffer = self._buffer_view(terms)
+        n_docs = sum(s.n_docs for s in segments) + buffer.n_docs
+        if n_docs == 0:
+            return [], np.zeros(0, dtype=np.int64)
+        avgdl = (sum(s.total_len for s in segments) + buffer.total_len) / n_docs
+
+        # Look each term up once per segment; df is global across all of them.
+        per_segment = []
+        df = Counter()
+        for seg in segments + [buffer]:
+            found = {}
+            for term in terms:
+                i = seg.lookup(term)
+                if i is not None:
+                    found[term] = i
+                    df[term] += int(seg.df[i])
+            per_segment.append((seg, found))
+        idf = {t: np.log1p((n_docs - df[t] + 0.5) / (df[t] + 0.5)) for t in df}
+
+        candidates, matched = [], [np.zeros(0, dtype=np.int64)]
+        for seg, found in per_segment:
+            if found:
+                hits, seg_matched = self._score_segment(seg, found, terms, idf, avgdl, k, allow)
+                candidates.extend(hits)
+                matched.append(seg_matched)
+        return heapq.nlargest(k, candidates, key=lambda hit: hit[1]), np.sort(np.concatenate(matched))
+
+    # ---------- internals ----------
+    @staticmethod
+    def _score_segment(seg, found, query_terms, idf, avgdl, k, allow=None):
+        scores = np.zeros(seg.n_docs, dtype=np.float64)
+        matched = np.zeros(seg.n_docs, dtype=bool)
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * np.asarray(seg.doclen, dtype=np.float64) / avgdl)
+        for term, i in found.items():
+            ords, tfs = seg.postings(i)
+            local = seg.local(ords)
+            matched[local] = True
+            if allow is not None:
+                keep = bitmaps.test(allow, ords)
+                local, tfs = local[keep], tfs[keep]
+            tf = tfs.astype(np.float64)
+            scores[local] += query_terms[term] * idf[term] * tf * (BM25_K1 + 1) / (tf + norm[local])
+        hit = np.flatnonzero(scores)
+        if hit.size > k:
+            hit = hit[np.argpartition(scores[hit], -k)[-k:]]
+        return [(int(seg.ordinals[j]), float(scores[j])) for j in hit], np.asarray(seg.ordinals)[matched]
+
+    def _buffer_view(self, terms):
+        return _BufferSegment({t: self._buf_postings[t] for t in terms if t in self._buf_postings},
+                              self._buf_doclen)
+
+    def _pick_merge(self):
+        tiers = defaultdict(list)
+        for seg in self._segments:
+            tier = int(np.log(max(seg.n_docs, 1)) / np.log(self.merge_factor))
+            tiers[tier].append(seg)
+        for tier in sorted(tiers):
+            if len(tiers[tier]) >= self.merge_factor:
+                return tiers[tier][:self.merge_factor]
+        return []
+
+    def _maintain(self):
+        while not self._closed.wait(1.0):
+            try:
+                with self._lock:
+                    due = self._buf_since is not None and time.time() - self._buf_since >= self.flush_interval
+                if due:
+                    self.flush()
+                while self.merge():
+                    pass
+            except Exception:  # keep the maintenance thread alive; the next tick retries
+                log.exception("Text index maintenance failed")
+
+    def _reset_buffer(self):
+        self._buf_postings = defaultdict(list)
+        self._buf_doclen = {}
+        self._buf_since = None
+
+    def _new_segment_path(self) -> Path:
+        with self._lock:
+            self._next_seg += 1
+            return self.path / f"seg_{self._next_seg:06d}"
+
+    def _read_manifest(self) -> dict:
+        try:
+            return json.loads((self.path / "manifest.json").read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _commit(self, segments, drop=()):
+        manifest = {"segments": [s.name for s in segments], "next_segment": self._next_seg}
+        tmp = self.path / "manifest.json.tmp"
+        tmp.write_text(json.dumps(manifest))
+        os.replace(tmp, self.path / "manifest.json")
+        self._segments = segments
+        self.version += 1
+        for seg in drop:
+            # Searches still holding the old segment keep their mmaps; on
+            # Windows the delete fails and the directory is swept at next open.
+            shutil.rmtree(seg.path, ignore_errors=True)
+
+    def _remove_orphans(self, live):
+        live = set(live)
+        for child in self.path.iterdir():
+            if child.is_dir() and child.name.startswith("seg_") and child.name not in live:
+                shutil.rmtree(child, ignore_errors=True)
+
+
+class _BufferSegment:
+    """Adapts the unflushed buffer to the segment interface used by search."""
+
+    def __init__(self, postings: dict, doclen: dict):
+        self.n_docs = len(doclen)
+        self.total_len = sum(doclen.values())
+        self.ordinals = np.array(sorted(doclen), dtype=np.int64)
+        self.doclen = np.array([doclen[o] for o in self.ordinals], dtype=np.uint32)
+        self._terms = list(postings)
+        self._postings = [np.array(sorted(postings[t]), dtype=np.int64) for t in self._terms]
+        self.df = [len(p) for p in self._postings]
+
+    def local(self, ords: np.ndarray) -> np.ndarray:
+        return np.searchsorted(self.ordinals, ords)
+
+    def lookup(self, term: str):
+        try:
+            return self._terms.index(term)
+        except ValueError:
+            return None
+
+    def postings(self, i: int):
+        arr = self._postings[i]
+        return arr[:, 0], arr[:, 1]
@@ -0,0 +1,274 @@
+"""Offline text embeddings and a memory-mapped vector store.
+
+`HashingEncoder` needs no model download: word unigrams, bigrams and short
+prefixes are hashed (with a random sign) into a fixed number of dimensions,
+which is a random projection of the bag-of-words vector. Similar documents
+share features, so cosine similarity between embeddings tracks overlap in
+vocabulary and phrasing.
+
+`VectorStore` keeps one row per document ordinal in a memory-mapped matrix,
+optionally int8-quantized with a per-row scale. Small stores are searched by
+batched brute force; once a store passes `ivf_min_rows` an IVF index
+(k-means centroids plus per-list row ids) is trained in the background and
+queries only scan the `nprobe` closest lists plus any rows added since.
+"""
+import json
+import logging
+import threading
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from akshrail import bitmaps
+from akshrail.mmapfiles import grow_memmap
+from akshrail.text import tokenize
+
+log = logging.getLogger(__name__)
+
+EMBED_DIM = 256
+
+
+class HashingEncoder:
+    def __init__(self, dim: int = EMBED_DIM, prefix_len: int = 5):
+        self.dim = dim
+        self.prefix_len = prefix_len
+
+    def features(self, text: str) -> list:
+        tokens = tokenize(text)
+        feats = list(tokens)
+        feats += [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        feats += [f"{t[:self.prefix_len]}~" for t in tokens if len(t) > self.prefix_len]
+        return feats
+
+    def encode(self, text: str) -> np.ndarray:
+        return self.encode_batch([text])[0]
+
+    def encode_batch(self, texts) -> np.ndarray:
+        """L2-normalized float32 embeddings, one row per text."""
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            # crc32 rather than hash(): embeddings must be stable across processes.
+            hashes = np.fromiter((zlib.crc32(f.encode()) for f in self.features(text)), dtype=np.uint32)
+            if hashes.size == 0:
+                continue
+            signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+            np.add.at(out[row], hashes % self.dim, signs)
+        # Sublinear term weighting, then unit length so dot product == cosine.
+        out = np.sign(out) * np.log1p(np.abs(out))
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        np.divide(out, norms, out=out, where=norms > 0)
+        return out
+
+
+DEFAULT_ENCODER = HashingEncoder()
+
+
+class VectorStore:
+    """Thread-safe store of unit vectors addressed by document ordinal."""
+
+    def __init__(self, path, dim: int = EMBED_DIM, dtype: str = "int8", ivf_min_rows: int = 50_000,
+                 nprobe: int = 8, chunk_rows: int = 65_536):
+        if dtype not in ("int8", "float32"):
+            raise ValueError(f"dtype must be 'int8' or 'float32', not {dtype!r}")
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.dim = dim
+        self.dtype = np.dtype(dtype)
+        self.ivf_min_rows = ivf_min_rows
+        self.nprobe = nprobe
+        self.chunk_rows = chunk_rows
+        self._lock = threading.Lock()
+        meta = self._read_meta()
+        if meta and (meta["dim"] != dim or meta["dtype"] != dtype):
+            raise ValueError(f"{self.path} holds {meta['dtype']} x {meta['dim']} vectors")
+        self.n_rows = meta.get("n_rows", 0)
+        self._capacity = 0
+        self._matrix = self._scales = None
+        self._ensure_capacity(max(self.n_rows, 1024))
+        self._ivf = self._load_ivf()
+        self._training = False
+        self._meta_written = 0.0
+
+    # ---------- writing ----------
+    def put(self, ordinal: int, vector: np.ndarray):
+        vector = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            self._ensure_capacity(ordinal + 1)
+            if self.dtype == np.int8:
+                scale = float(np.abs(vector).max()) / 127 or 1.0
+                self._matrix[ordinal] = np.round(vector / scale).astype(np.int8)
+                self._scales[ordinal] = scale
+            else:
+                self._matrix[ordinal] = vector
+            if ordinal >= self.n_rows:
+                self.n_rows = ordinal + 1
+                if time.time() - self._meta_written > 1.0:  # flush() writes the final count
+                    self._write_meta()
+        self._maybe_train()
+
+    def flush(self):
+        with self._lock:
+            self._matrix.flush()
+            if self._scales is not None:
+                self._scales.flush()
+            self._write_meta()
+
+    # ---------- reading ----------
+    def scores(self, query: np.ndarray, ordinals) -> np.ndarray:
+        """Cosine similarity of `query` against specific rows."""
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        out = np.zeros(ordinals.size, dtype=np.float32)
+        stored = ordinals < self.n_rows
+        out[stored] = self._dot(ordinals[stored], np.asarray(query, dtype=np.float32))
+        return out
+
+    def scan(self, query: np.ndarray) -> np.ndarray:
+        """Exact cosine similarity of `query` against every stored row, indexed by ordinal."""
+        query, n = np.asarray(query, dtype=np.float32), self.n_rows
+        return np.concatenate([self._dot(np.arange(s, min(s + self.chunk_rows, n)), query, contiguous=True)
+                               for s in range(0, n, self.chunk_rows)] or [np.zeros(0, np.float32)])
+
+    def vectors(self, ordinals) -> np.ndarray:
+        """Stored rows as float32 (dequantized); rows never written are zero."""
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        if ordinals.size and ordinals.max() >= self.n_rows:
+            raise KeyError(int(ordinals.max()))
+        return self._unit_rows(ordinals)
+
+    def search(self, query: np.ndarray, k: int = 10, allow: np.ndarray = None):
+        """Approximate top-k (ordinal, cosine) pairs, best first.
+
+        With an `allow` bitmap (see `akshrail.bitmaps`) only those rows are scored.
+        """
+        query = np.asarray(query, dtype=np.float32)
+        n = self.n_rows
+        if n == 0:
+            return []
+        ivf = self._ivf
+        if ivf is not None and ivf["n_rows"] <= n:
+            candidates = self._ivf_candidates(ivf, query, n)
+            if allow is not None:
+                candidates = candidates[bitmaps.test(allow, candidates)]
+            sims = self._dot(candidates, query)
+            return _top_k(candidates, sims, k)
+        if allow is not None:
+            allowed = bitmaps.to_ordinals(allow)
+            allowed = allowed[allowed < n]
+            if allowed.size < n // 2:  # a selective filter: gather only the allowed rows
+                sims = np.concatenate([self._dot(allowed[i:i + self.chunk_rows], query)
+                                       for i in range(0, allowed.size, self.chunk_rows)] or [np.zeros(0, np.float32)])
+                return _top_k(allowed, sims, k)
+        best_ids, best_sims = [], []
+        for start in range(0, n, self.chunk_rows):
+            rows = np.arange(start, min(start + self.chunk_rows, n))
+            sims = self._dot(rows, query, contiguous=True)
+            if allow is not None:
+                sims[~bitmaps.test(allow, rows)] = -np.inf
+            keep = min(k, sims.size)
+            top = np.argpartition(sims, -keep)[-keep:]
+            best_ids.append(rows[top])
+            best_sims.append(sims[top])
+        return _top_k(np.concatenate(best_ids), np.concatenate(best_sims), k)
+
+    # ---------- internals ----------
+    def _dot(self, rows: np.ndarray, query: np.ndarray, contiguous: bool = False) -> np.ndarray:
+        if rows.size == 0:
+            return np.zeros(0, dtype=np.float32)
+        matrix, scales = self._matrix, self._scales
+        block = matrix[rows[0]:rows[-1] + 1] if contiguous else matrix[rows]
+        sims = block.astype(np.float32, copy=False) @ query
+        if scales is not None:
+            sims *= scales[rows[0]:rows[-1] + 1] if contiguous else scales[rows]
+        return sims
+
+    def _ivf_candidates(self, ivf, query, n):
+        probe = np.argpartition(ivf["centroids"] @ query, -self.nprobe)[-self.nprobe:] \
+            if len(ivf["centroids"]) > self.nprobe else np.arange(len(ivf["centroids"]))
+        offsets, order = ivf["offsets"], ivf["order"]
+        parts = [order[offsets[c]:offsets[c + 1]] for c in probe]
+        parts.append(np.arange(ivf["n_rows"], n))  # rows added since training
+        return np.sort(np.concatenate(parts))
+
+    def _maybe_train(self):
+        with self._lock:  # check and claim together, so concurrent puts start one training
+            ivf = self._ivf
+            trained = ivf["n_rows"] if ivf is not None else 0
+            if self.n_rows < self.ivf_min_rows or self._training or self.n_rows < trained * 1.25:
+                return
+            self._training = True
+        threading.Thread(target=self._train, name="vector-ivf", daemon=True).start()
+
+    def _train(self, iterations: int = 10, sample: int = 20_000, seed: int = 0):
+        try:
+            n = self.n_rows
+            n_lists = int(min(1024, max(16, 4 * np.sqrt(n))))
+            rng = np.random.default_rng(seed)
+            sample_rows = np.sort(rng.choice(n, size=min(sample, n), replace=False))
+            data = self._unit_rows(sample_rows)
+            centroids = data[rng.choice(len(data), size=n_lists, replace=False)]
+            for _ in range(iterations):
+                assign = np.argmax(data @ centroids.T, axis=1)
+                for c in range(n_lists):
+                    members = data[assign == c]
+                    if len(members):
+                        centroids[c] = members.mean(axis=0)
+                centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+            assign = np.concatenate([
+                np.argmax(self._unit_rows(np.arange(s, min(s + self.chunk_rows, n))) @ centroids.T, axis=1)
+                for s in range(0, n, self.chunk_rows)
+            ])
+            order = np.argsort(assign, kind="stable").astype(np.int64)
+            offsets = np.zeros(n_lists + 1, dtype=np.int64)
+            offsets[1:] = np.cumsum(np.bincount(assign, minlength=n_lists))
+            ivf = {"centroids": centroids.astype(np.float32), "order": order, "offsets": offsets, "n_rows": n}
+            np.savez(self.path / "ivf.tmp.npz", **ivf)
+            (self.path / "ivf.tmp.npz").replace(self.path / "ivf.npz")
+            self._ivf = ivf
+        except Exception:
+            log.exception("IVF training failed; brute-force search remains in use")
+        finally:
+            with self._lock:
+                self._training = False
+
+    def _unit_rows(self, rows):
+        block = self._matrix[rows].astype(np.float32)
+        if self._scales is not None:
+            block *= self._scales[rows][:, None]
+        return block
+
+    def _ensure_capacity(self, rows: int):
+        if rows <= self._capacity:
+            return
+        capacity = max(rows, 2 * self._capacity)
+        self._matrix = grow_memmap(self.path / f"vectors.{self.dtype.name}", self.dtype, (capacity, self.dim))
+        if self.dtype == np.int8:
+            self._scales = grow_memmap(self.path / "scales.float32", np.float32, (capacity,))
+        self._capacity = capacity
+
+    def _load_ivf(self):
+        try:
+            with np.load(self.path / "ivf.npz") as f:
+                return {key: f[key] for key in ("centroids", "order", "offsets")} | {"n_rows": int(f["n_rows"])}
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _read_meta(self) -> dict:
+        try:
+            return json.loads((self.path / "meta.json").read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _write_meta(self):
+        meta = {"n_rows": self.n_rows, "dim": self.dim, "dtype": self.dtype.name}
+        (self.path / "meta.json").write_text(json.dumps(meta))
+        self._meta_written = time.time()
+
+
+def _top_k(ids: np.ndarray, sims: np.ndarray, k: int):
+    if sims.size > k:
+        top = np.argpartition(sims, -k)[-k:]
+        ids, sims = ids[top], sims[top]
+    order = np.argsort(-sims)
+    return [(int(ids[i]), float(sims[i])) for i in order if sims[i] > -np.inf]  # -inf marks filtered rows
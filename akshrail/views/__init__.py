@@ -0,0 +1,44 @@
+"""Page router for the Streamlit app.
+
+Every page is a module in this package with a `render()` function. A page
+module is imported the first time someone opens that page, so the landing
+page never pays for pandas, Plotly or the search stores. First-load times
+are logged and kept in `load_times` (seconds, by page name);
+`python -m akshrail.bench --imports` reports cold import costs.
+"""
+import importlib
+import logging
+import sys
+import time
+
+from akshrail import telemetry
+
+log = logging.getLogger(__name__)
+
+PAGES = {
+    "Home": "akshrail.views.home",
+    "Dashboard": "akshrail.views.dashboard",
+    "Upload": "akshrail.views.upload",
+    "Search": "akshrail.views.search",
+    "Analytics": "akshrail.views.analytics",
+    "About": "akshrail.views.about",
+}
+
+load_times = {}
+
+
+def load(name: str):
+    """The page module for `name`, importing it on first use."""
+    module_name = PAGES[name]
+    module = sys.modules.get(module_name)
+    if module is None:
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        load_times[name] = time.perf_counter() - start
+        log.info("Loaded page %s in %.0f ms", name, load_times[name] * 1000)
+    return module
+
+
+def render(name: str):
+    with telemetry.span(f"page.{name.lower()}"):
+        load(name).render()
@@ -0,0 +1,38 @@
+"""About page."""
+import streamlit as st
+from streamlit_lottie import st_lottie
+
+from akshrail.views.common import load_lottie
+
+
+def render():
+    st.subheader("ℹ️ About AkshRail: Powering Kochi Metro's Future")
+    st.write("AkshRail is a brainchild developed to tackle the challenges of document overload and information fragmentation at Kochi Metro Rail Limited.")
+
+    col_about_text, col_about_lottie = st.columns([2, 1])
+    with col_about_text:
+        st.markdown("#### Our Vision")
+        st.write("To establish a seamless, intelligent, and accessible document management ecosystem that enhances operational efficiency, fosters collaboration, and safeguards critical organizational knowledge for Kochi Metro.")
+        st.markdown("#### The Team")
+        st.write("This solution is developed by a dedicated team with expertise in AI, web development, and data management, committed to delivering a robust and user-friendly system.")
+        st.markdown("#### Get in Touch")
+        st.write("For support, feedback, or further inquiries, please contact our development team.")
+        st.markdown("---")
+        st.markdown("🚀 Built with passion using:")
+        st.markdown("""
+        - **Python:** The backbone of our AI and backend logic.
+        - **Streamlit:** For creating beautiful and interactive web applications with ease.
+        - **Flask/Django:** Robust backend frameworks for API development and task management.
+        - **AI (NLP & OCR):** The intelligence that powers summarization, search, and data extraction.
+        - **ElasticSearch:** For lightning-fast, intelligent search and document indexing.
+        - **PostgreSQL/MongoDB:** Reliable databases for structured and unstructured data storage.
+        - **Cloud Storage:** For scalable and secure document storage (e.g., AWS S3, Google Cloud Storage).
+        """)
+
+    with col_about_lottie:
+        about_lottie = load_lottie("about")
+        if about_lottie:
+            st_lottie(about_lottie, height=300, key="about_animation")
+
+    st.markdown("---")
+    st.write("© 2025 AkshRail. All rights reserved.")
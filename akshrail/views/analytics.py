@@ -0,0 +1,104 @@
+"""Analytics: upload trends, status mix and the most searched keywords."""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+from streamlit_lottie import st_lottie
+
+from akshrail.charts import MAX_POINTS, downsample
+from akshrail.views.common import get_figure_cache, get_services, load_lottie
+
+
+def render():
+    st.subheader("📈 Analytics & Insights")
+    st.info("Unlock meaningful insights from your document data. Visualize trends, identify bottlenecks, and monitor system usage.")
+
+    analytics_lottie = load_lottie("analytics")
+    if analytics_lottie:
+        st_lottie(analytics_lottie, height=200, key="analytics_animation")
+    st.markdown("---")
+
+    rollups = get_services().rollups
+    figures = get_figure_cache()
+    today = date.today()
+    col_range, col_grain = st.columns([2, 1])
+    with col_range:
+        default_start = (pd.Timestamp(today) - pd.DateOffset(months=11)).replace(day=1).date()
+        date_range = st.date_input("Upload date range", value=(default_start, today), max_value=today)
+    with col_grain:
+        granularity = st.selectbox("Group uploads by", ["Monthly", "Weekly", "Daily"], index=0)
+    range_start, range_end = (date_range[0], date_range[-1]) if date_range else (default_start, today)
+
+    col_chart1, col_chart2 = st.columns(2)
+
+    with col_chart1:
+        st.markdown(f"#### {granularity} Document Uploads")
+        # Pre-aggregated counts: cost depends on the number of buckets, not documents.
+        bucket = {"Monthly": "month", "Weekly": "week", "Daily": "day"}[granularity]
+
+        def build_uploads():
+            uploads = rollups.series(bucket, range_start, range_end)
+            counts = np.fromiter(uploads.values(), dtype=np.int64, count=len(uploads))
+            # Years of daily points would swamp the browser; keep the shape in ~MAX_POINTS.
+            keep = downsample(counts, MAX_POINTS)
+            df_uploads = pd.DataFrame({"Period": np.array(list(uploads.keys()))[keep], "Uploads": counts[keep]})
+            return px.line(df_uploads, x="Period", y="Uploads", markers=True,
+                           title=f"{granularity} Document Upload Trend",
+                           labels={"Uploads": "Number of Documents"},
+                           color_discrete_sequence=["#1f77b4"]) # Blue line
+
+        fig_uploads = figures.get("analytics.uploads", rollups.version,
+                                  {"bucket": bucket, "start": range_start, "end": range_end}, build_uploads)
+        st.plotly_chart(fig_uploads, use_container_width=True)
+
+    with col_chart2:
+        st.markdown("#### Document Status Distribution")
+        status_counts = rollups.counts_by("status", range_start, range_end)
+
+        def build_status():
+            status_data = pd.DataFrame({
+                "Status": list(status_counts.keys()),
+                "Count": list(status_counts.values())
+            })
+            return px.bar(status_data, x="Status", y="Count",
+                          title="Current Document Status",
+                          color="Status",
+                          color_discrete_sequence=px.colors.qualitative.G10) # Colorful bars
+
+        fig_status = figures.get("analytics.status", rollups.version,
+                                 {"start": range_start, "end": range_end}, build_status)
+        st.plotly_chart(fig_status, use_container_width=True)
+        if not status_counts:
+            st.caption("No documents were uploaded in this date range.")
+
+    st.markdown("---")
+    st.markdown("#### Top 5 Most Searched Keywords")
+    keyword_window = st.radio("Period", ["Today", "Last 7 days", "Last 30 days"], index=1, horizontal=True)
+    keywords = get_services().keywords
+    top_keywords = keywords.top(5, window={"Today": "today", "Last 7 days": "7d", "Last 30 days": "30d"}[keyword_window])
+    if top_keywords:
+        def build_keywords():
+            df_keywords = pd.DataFrame(top_keywords, columns=["Keyword", "Search Count"])
+            return px.bar(df_keywords.sort_values("Search Count", ascending=True),
+                          x="Search Count", y="Keyword", orientation='h',
+                          title="Most Frequent Search Terms",
+                          color_discrete_sequence=["#2ca02c"]) # Green bars
+
+        fig_keywords = figures.get("analytics.keywords", keywords.version,
+                                   {"window": keyword_window, "today": today}, build_keywords)
+        st.plotly_chart(fig_keywords, use_container_width=True)
+    else:
+        st.info("No searches recorded in this period yet.")
+
+    with st.expander("🛠️ Functions and Technologies on Analytics Page"):
+        st.write("""
+        - **Data Aggregation (Backend & Database/ElasticSearch):** Analytics charts are powered by aggregated data from **PostgreSQL/MongoDB** (for structured metadata) and **ElasticSearch** (for operational metrics like search counts).
+        - **Plotly Express (`plotly.express`):** Used for creating interactive and visually rich charts:
+            - **Line Charts:** For showing trends over time (e.g., monthly uploads).
+            - **Bar Charts:** For comparing categories (e.g., document status, top keywords).
+            - **Pie Charts (on Dashboard):** For showing distribution.
+        - **Data Processing (Pandas):** Data fetched from the backend is processed and formatted using **Pandas DataFrames** before being visualized.
+        - **Backend Analytics Engine (Flask/Django):** A dedicated backend service calculates and provides the aggregated data required for these visualizations.
+        """)
@@ -0,0 +1,71 @@
+"""Process-wide resources shared by the pages, each created on first use."""
+import io
+from pathlib import Path
+
+import streamlit as st
+
+from akshrail import config, telemetry
+from akshrail.assets import LOTTIE_URLS, LottieLoader
+
+LOGO_PATH = config.ROOT_DIR / "Screenshot (4).png"
+LOGO_WIDTH = 180
+
+
+# ---------- Function to load Lottie animation ----------
+@st.cache_resource
+def get_lottie_loader():
+    # One loader per process: its memory/disk caches are shared by every session,
+    # and the remaining animations are warmed in the background after first use.
+    loader = LottieLoader()
+    loader.prefetch(LOTTIE_URLS.values())
+    return loader
+
+
+def load_lottie(name: str):
+    with telemetry.span("lottie.load"):
+        return get_lottie_loader().get(LOTTIE_URLS[name])
+
+
+# ---------- Shared backend services ----------
+@st.cache_resource
+def get_services():
+    # Stores and worker pools live for the whole process and are shared by all sessions.
+    # Imported here so pages that show no data never load numpy, SQLite or the indexes.
+    from akshrail.services import Services
+
+    return Services(compute="process")
+
+
+@st.cache_resource
+def get_figure_cache():
+    # Shared by all sessions: a chart is built once per data version, not once per rerun.
+    from akshrail.charts import FigureCache
+
+    figures = FigureCache()
+    telemetry.register_cache("chart figures", figures)
+    return figures
+
+
+# ---------- Static assets ----------
+@st.cache_resource
+def get_logo():
+    """The logo as PNG bytes scaled for display, or None when the file is missing.
+
+    Decoded and resized once per process; handing st.image ready-made bytes
+    skips the PIL re-encode it would otherwise do on every rerun.
+    """
+    from PIL import Image
+
+    try:
+        image = Image.open(LOGO_PATH)
+    except FileNotFoundError:
+        return None
+    image.thumbnail((LOGO_WIDTH * 2, LOGO_WIDTH * 4))  # 2x for high-DPI screens
+    buf = io.BytesIO()
+    image.save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
+@st.cache_resource
+def get_css() -> str:
+    return "<style>\n" + (Path(__file__).parent / "app.css").read_text(encoding="utf-8") + "</style>"
@@ -0,0 +1,150 @@
+"""Dashboard: KPI tiles, recent activity, the document type mix and system health."""
+import json
+from datetime import datetime, timedelta
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+from streamlit_lottie import st_lottie
+
+from akshrail import telemetry
+from akshrail.views.common import get_figure_cache, get_services, load_lottie
+
+
+def render():
+    st.subheader("📊 AkshRail Dashboard")
+    st.info("Your main control center: Get an overview of document activity, pending tasks, and system health.")
+
+    col_metrics, col_lottie_dash = st.columns([2, 1])
+    with col_metrics:
+        # Improved Metrics with custom colors
+        st.markdown(
+            """
+            <style>
+            .metric-box {
+                background-color: #f8f9fa;
+                border-radius: 10px;
+                padding: 15px;
+                margin-bottom: 15px;
+                box-shadow: 2px 2px 8px rgba(0,0,0,0.1);
+            }
+            .metric-label {
+                font-size: 16px;
+                color: #555;
+            }
+            .metric-value {
+                font-size: 32px;
+                font-weight: bold;
+                color: #007bff; /* Primary blue */
+            }
+            </style>
+            """, unsafe_allow_html=True
+        )
+
+        kpis = get_services().metastore.kpis()
+        st.markdown(f'<div class="metric-box"><div class="metric-label">Total Documents Indexed</div><div class="metric-value">{kpis["total"]:,}</div></div>', unsafe_allow_html=True)
+        st.markdown(f'<div class="metric-box"><div class="metric-label">Documents Awaiting Review</div><div class="metric-value">{kpis["awaiting_review"]:,}</div></div>', unsafe_allow_html=True)
+        st.markdown(f'<div class="metric-box"><div class="metric-label">New Uploads This Month</div><div class="metric-value">{kpis["this_month"]:,}</div></div>', unsafe_allow_html=True)
+
+    with col_lottie_dash:
+        alert_lottie = load_lottie("alert")
+        if alert_lottie:
+            st_lottie(alert_lottie, height=200, key="dashboard_alert_lottie")
+        st.markdown("---")
+        st.markdown("#### Quick Actions")
+        if st.button("Review Pending Documents"):
+            st.session_state.menu = "Search" # Example of changing menu based on action
+            st.experimental_rerun()
+        if st.button("Upload New Document"):
+            st.session_state.menu = "Upload"
+            st.experimental_rerun()
+
+
+    st.markdown("---")
+    st.subheader("Recent Document Activity")
+    render_activity()
+
+    st.markdown("---")
+    st.subheader("Document Type Distribution")
+    rollups = get_services().rollups
+
+    def build_pie():
+        type_counts = pd.DataFrame(sorted(rollups.counts_by("doc_type").items()), columns=["Document Type", "Count"])
+        return px.pie(type_counts, values='Count', names='Document Type', title='Distribution by Document Type',
+                      color_discrete_sequence=px.colors.qualitative.Pastel)
+
+    # Counts come from the maintained rollups; the figure is rebuilt only when they change.
+    fig_pie = get_figure_cache().get("dashboard.type_pie", rollups.version, {}, build_pie)
+    st.plotly_chart(fig_pie, use_container_width=True)
+
+    st.markdown("---")
+    st.subheader("System Health")
+    render_system_health()
+
+    with st.expander("🛠️ Functions and Technologies on Dashboard"):
+        st.write("""
+        - **Metrics & KPIs:** Displays key performance indicators from the database (PostgreSQL/MongoDB) like total documents, pending reviews, calculated by aggregation queries.
+        - **Lottie Animations:** Uses `streamlit_lottie` to display dynamic alerts and notifications.
+        - **Data Table (`st.dataframe`):** Pages through the Arrow activity log (`akshrail.activity`) newest first; only the selected time window, page and columns are read.
+        - **Pie Chart (`plotly.express`):** Visualizes the distribution of document types from the maintained per-type rollups, providing quick insights.
+        - **System Health:** Latency histograms recorded by `akshrail.telemetry` spans around page renders, searches, chart building and each ingest stage, with cache hit ratios; exportable as JSON.
+        - **Interactive Buttons:** Allows direct navigation to other sections (e.g., "Upload") to streamline workflows.
+        """)
+
+
+ACTIVITY_WINDOWS = {"Last 24 hours": timedelta(days=1), "Last 7 days": timedelta(days=7),
+                    "Last 30 days": timedelta(days=30), "All time": None}
+ACTIVITY_COLUMNS = {"at": "Time", "doc_id": "Document ID", "title": "Title", "doc_type": "Type",
+                    "action": "Action", "status": "Status"}
+ACTIVITY_PAGE_SIZE = 25
+
+
+def render_activity():
+    col_window, col_prev, col_next = st.columns([3, 1, 1])
+    window = col_window.selectbox("Time window", list(ACTIVITY_WINDOWS), index=1, key="activity_window",
+                                  on_change=lambda: st.session_state.update(activity_page=0))
+    page = st.session_state.setdefault("activity_page", 0)
+    span = ACTIVITY_WINDOWS[window]
+    with telemetry.span("dashboard.activity"):
+        table, total = get_services().activity.page(
+            start=datetime.now() - span if span else None, offset=page * ACTIVITY_PAGE_SIZE,
+            limit=ACTIVITY_PAGE_SIZE, columns=list(ACTIVITY_COLUMNS))
+    col_prev.button("◀ Newer", disabled=page == 0, use_container_width=True,
+                    on_click=lambda: st.session_state.update(activity_page=page - 1))
+    col_next.button("Older ▶", disabled=(page + 1) * ACTIVITY_PAGE_SIZE >= total, use_container_width=True,
+                    on_click=lambda: st.session_state.update(activity_page=page + 1))
+    if not total:
+        st.caption("No document activity in this window.")
+        return
+    # Streamlit sends Arrow to the browser, so the page goes out without a pandas round trip.
+    st.dataframe(table.rename_columns(list(ACTIVITY_COLUMNS.values())), hide_index=True, use_container_width=True)
+    first = page * ACTIVITY_PAGE_SIZE + 1
+    st.caption(f"Events {first:,}–{first + table.num_rows - 1:,} of {total:,}, newest first.")
+
+
+@st.fragment(run_every=5.0)
+def render_system_health():
+    # Refreshes on its own every few seconds without rerunning the rest of the page.
+    snapshot = telemetry.REGISTRY.snapshot()
+    caches = snapshot["caches"]
+    if caches:
+        for column, (name, stats) in zip(st.columns(len(caches)), caches.items()):
+            ratio = stats["hit_ratio"]
+            column.metric(f"Cache hit ratio: {name}", "–" if ratio is None else f"{ratio:.0%}",
+                          help=f"{stats['hits']:,} hits, {stats['misses']:,} misses since {snapshot['started_at']}")
+    sections = snapshot["sections"]
+    if sections:
+        df_health = pd.DataFrame([
+            {"Section": name, "Calls": stats["calls"], "Calls/min": stats["per_min"], "p50 (ms)": stats["p50_ms"],
+             "p95 (ms)": stats["p95_ms"], "p99 (ms)": stats["p99_ms"], "Max (ms)": stats["max_ms"]}
+            for name, stats in sections.items()
+        ])
+        st.dataframe(df_health, hide_index=True, use_container_width=True,
+                     column_config={c: st.column_config.NumberColumn(format="%.1f")
+                                    for c in ["Calls/min", "p50 (ms)", "p95 (ms)", "p99 (ms)", "Max (ms)"]})
+        st.caption("Latency percentiles are bucket upper bounds (within 12.5%); call rates cover the last minute.")
+    else:
+        st.caption("No timings recorded yet.")
+    st.download_button("Export timings (JSON)", json.dumps(snapshot, indent=2),
+                       file_name="akshrail-telemetry.json",
+                       mime="application/json")
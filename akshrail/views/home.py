@@ -0,0 +1,77 @@
+"""Landing page."""
+import streamlit as st
+from streamlit_lottie import st_lottie
+
+from akshrail.views.common import load_lottie
+
+
+def render():
+    st.header("Welcome to AkshRail")
+    st.markdown("### Intelligent Document Management for Kochi Metro Rail")
+
+    col_lottie, col_text = st.columns([1, 2])
+    with col_lottie:
+        home_lottie = load_lottie("home")
+        if home_lottie:
+            st_lottie(home_lottie, height=250, key="home_welcome")
+    with col_text:
+        st.write("""
+        AkshRail is an **AI-powered solution** designed to revolutionize document management for Kochi Metro Rail Limited.
+        Say goodbye to manual filing and hello to automated summaries, intelligent search, and actionable insights.
+        """)
+        st.info("Our mission: To transform document overload into a streamlined, efficient information hub.")
+
+    st.markdown("---")
+    st.subheader("🚀 Core Capabilities")
+    col_cap1, col_cap2, col_cap3 = st.columns(3)
+    with col_cap1:
+        st.markdown("#### OCR & Text Extraction")
+        st.markdown("Extracts text from scanned PDFs, images, and various document formats with high accuracy.")
+    with col_cap2:
+        st.markdown("#### NLP for Insights")
+        st.markdown("Summarizes content, identifies key entities, and detects duplicates using advanced Natural Language Processing.")
+    with col_cap3:
+        st.markdown("#### Smart Search & Linkage")
+        st.markdown("Provides blazing-fast search capabilities and automatically links related documents for comprehensive understanding.")
+
+    st.markdown("---")
+
+    st.subheader("💡 Technologies & Functions Overview")
+    with st.expander("Explore Technologies Used"):
+        st.write("""
+        - **OCR (Optical Character Recognition):** Leverages Tesseract or cloud-based OCR services to convert scanned documents into editable and searchable text.
+        - **NLP (Natural Language Processing):** Utilizes libraries like **SpaCy** for entity recognition and summarization, and potentially **Hugging Face Transformers** for more advanced contextual understanding and duplicate checking.
+        - **ElasticSearch:** A powerful, distributed search and analytics engine for storing, indexing, and enabling lightning-fast searches across all documents. Also used for creating semantic links between documents.
+        - **Database (PostgreSQL/MongoDB):** **PostgreSQL** for structured metadata (document IDs, upload dates, user info) and **MongoDB** for flexible storage of document content and processed NLP data.
+        - **Backend (Flask/Django):** A robust **Flask** API handles document uploads, OCR processing, NLP tasks, database interactions, and pushes notifications.
+        - **Frontend (Streamlit/React):** **Streamlit** for the interactive, staff-friendly dashboards and **React** (if a more complex, scalable web app is needed later) for richer UI/UX.
+        - **Multi-language Support:** Integration with NLP models capable of processing **English & Malayalam** text.
+        """)
+    with st.expander("🛠️ Methodology (Stepwise)"):
+        st.write("""
+        1. **Document Upload:** Staff uploads documents (PDF/TXT/Scans) via a secure web interface.
+        2. **Text Extraction (OCR):** Scanned documents undergo OCR to extract text content, which is then cleaned and pre-processed.
+        3. **Processing & Summarization (NLP):** Extracted text is fed into NLP pipelines for summarization, keyword extraction, and identifying potential duplicates.
+        4. **Smart Storage & Search (ElasticSearch & DB):** Documents and their metadata (summaries, keywords, entities) are indexed in ElasticSearch and stored in the database for efficient retrieval and linking.
+        5. **Alerts & Dashboards:** Role-based dashboards provide staff with an overview, and a notification system delivers critical updates and alerts.
+        """)
+
+
+    with st.expander("🌟 How it Differs from Current Metro System"):
+        st.write("""
+         - Current system relies heavily on **manual reading and filing**, leading to inefficiencies.
+        - AkshRail automatically **summarizes, searches, and intelligently links documents**, saving countless hours.
+         - Provides **role-specific dashboards** for tailored information access.
+         - Offers robust **multi-language support** (English & Malayalam) for broader usability.
+         - Implements smart **alerts & notifications** for critical updates and deadlines.
+            """)
+
+    with st.expander("✅ Key Benefits"):
+        st.write("""
+            - **Saves significant time**: Quick access to summaries and search results.
+            - **Improves teamwork & collaboration**: Centralized, easily searchable access for all authorized staff.
+            - **Ensures compliance**: Highlights critical updates and policy changes.
+            - **Reduces duplicated effort**: Automatic duplicate detection and summaries prevent redundant work.
+            - **Preserves institutional knowledge**: Creates a living archive of company documents and insights.
+            - **Enhances decision-making**: Provides data-driven insights from document analytics.
+            """)
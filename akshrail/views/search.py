@@ -0,0 +1,114 @@
+"""Smart search with facet filters and paged results."""
+import streamlit as st
+from streamlit_lottie import st_lottie
+
+from akshrail.documents import DOCUMENT_TYPES, STATUSES
+from akshrail.views.common import get_services, load_lottie
+
+SEARCH_PAGE_SIZE = 10
+SEARCH_FACETS = {"doc_type": "Document Type", "status": "Status", "month": "Upload Month"}
+
+
+def render():
+    st.subheader("🔍 Smart Search & Retrieve Documents")
+    st.info("Find any document instantly with advanced search capabilities. Use keywords, document IDs, or even natural language queries.")
+
+    col_search_input, col_search_lottie = st.columns([2, 1])
+    with col_search_input:
+        query = st.text_input("Enter keywords, document ID, or a natural language query:", placeholder="e.g., 'Maintenance report Q3', 'invoice from ABC Corp', 'Safety guidelines'")
+        col_search_btn, col_search_filter = st.columns([1, 1])
+        with col_search_btn:
+            search_button = st.button("Perform Smart Search")
+        col_status_filter, col_month_filter = st.columns([1, 1])
+
+    with col_search_lottie:
+        search_lottie = load_lottie("search")
+        if search_lottie:
+            st_lottie(search_lottie, height=200, key="search_animation")
+
+    st.markdown("---")
+
+    if search_button and query:
+        # Remember the search so paging and "View" clicks can re-render it from the cache.
+        st.session_state["search"] = {"query": query, "cursors": [None]}
+        get_services().keywords.record(query)
+    elif search_button:
+        st.warning("Please enter a search query.")
+
+    # The filter widgets are drawn below (labelled with this search's counts),
+    # but their values for this rerun are already in session state.
+    filters = {field: st.session_state.get(f"facet_{field}", []) for field in SEARCH_FACETS}
+    search_state = st.session_state.get("search")
+    page = None
+    if search_state:
+        page = get_services().search_page(search_state["query"], filters, cursor=search_state["cursors"][-1],
+                                          page_size=SEARCH_PAGE_SIZE)
+
+    facet_options = {"doc_type": DOCUMENT_TYPES, "status": STATUSES, "month": get_services().facets.values("month")}
+    for column, field in zip([col_search_filter, col_status_filter, col_month_filter], SEARCH_FACETS):
+        with column:
+            counts = page.facets[field] if page else None
+            st.multiselect(f"Filter by {SEARCH_FACETS[field]}", facet_options[field], key=f"facet_{field}",
+                           format_func=lambda v, c=counts: f"{v} ({c.get(v, 0)})" if c is not None else v,
+                           on_change=reset_search_paging)
+
+    if search_state:
+        selected = [v for values in filters.values() for v in values]
+        st.success(f"Searching for: **'{search_state['query']}'** (Filters: {', '.join(selected) if selected else 'None'})")
+        if page.hits:
+            st.subheader("Search Results")
+            st.caption(f"Showing {page.start + 1}–{page.start + len(page.hits)} of {page.total}")
+            for doc, score in page.hits:
+                st.markdown(f"#### {doc.title} (ID: {doc.doc_id})")
+                st.markdown(f"**Type:** {doc.doc_type} | **Relevance:** {score:.0%}")
+                with st.expander("Read Preview"):
+                    st.write(f"Summary: {doc.summary}" if doc.summary else "No summary available.")
+                    opening = get_services().preview(doc)
+                    if opening:
+                        st.text(opening)
+                st.button(f"View {doc.doc_id}", key=f"view_{doc.doc_id}", on_click=toggle_view, args=(doc.ordinal,))
+                if st.session_state.get("view_doc") == doc.ordinal:
+                    render_related(doc)
+                st.markdown("---")
+            col_prev, col_next = st.columns(2)
+            with col_prev:
+                st.button("← Previous", disabled=len(search_state["cursors"]) == 1,
+                          on_click=lambda: search_state["cursors"].pop())
+            with col_next:
+                st.button("Next →", disabled=page.next_cursor is None,
+                          on_click=lambda cursor=page.next_cursor: search_state["cursors"].append(cursor))
+        else:
+            st.warning("No documents found matching your query and filters.")
+
+    with st.expander("🛠️ Functions and Technologies on Search Page"):
+        st.write("""
+        - **Text Input & Buttons (`st.text_input`, `st.button`):** User interface for entering search queries and initiating searches.
+        - **Multi-select Filter (`st.multiselect`):** Allows users to refine searches by document type.
+        - **ElasticSearch (Backend):** This is the core technology. When a query is submitted, it's sent to the **ElasticSearch** index.
+            - **Full-Text Search:** ElasticSearch performs fast and relevant full-text searches on document content and summaries.
+            - **Faceted Search:** Filters by document type are handled efficiently by ElasticSearch's aggregation capabilities.
+            - **Semantic Search (NLP):** If the query involves natural language, NLP models (e.g., **Hugging Face sentence transformers**) can convert the query into an embedding, which ElasticSearch then uses for vector similarity search to find semantically similar documents.
+        - **Relevance Ranking:** ElasticSearch provides relevance scores to order results.
+        - **Related Documents:** "View" lists each result's nearest neighbours by embedding similarity, precomputed at ingest time (`akshrail.related`).
+        - **Backend API (Flask/Django):** Handles the communication between Streamlit and ElasticSearch, processes queries, and formats results.
+        """)
+
+
+def toggle_view(ordinal: int):
+    st.session_state["view_doc"] = None if st.session_state.get("view_doc") == ordinal else ordinal
+
+
+def render_related(doc):
+    # Precomputed at ingest: reading a document's neighbours is a row lookup, not a search.
+    related = get_services().related(doc.ordinal)
+    with st.container(border=True):
+        st.markdown(f"**Related to {doc.doc_id}**")
+        if not related:
+            st.caption("No related documents found yet.")
+        for other, similarity in related:
+            st.markdown(f"- **{other.title}** ({other.doc_id}, {other.doc_type}) — {similarity:.0%} similar")
+
+
+def reset_search_paging():
+    if "search" in st.session_state:
+        st.session_state["search"]["cursors"] = [None]
@@ -0,0 +1,99 @@
+"""Upload form and the live status of this session's processing jobs."""
+import streamlit as st
+from streamlit_lottie import st_lottie
+
+from akshrail.documents import DOCUMENT_TYPES, UPLOAD_EXTENSIONS
+from akshrail.pipeline import QueueFull
+from akshrail.views.common import get_services, load_lottie
+
+
+def render():
+    st.subheader("📤 Upload New Documents to AkshRail")
+    st.info("Effortlessly upload engineering drawings, invoices, reports, and various other document types. Our system will automatically process them.")
+
+    col_upload_form, col_upload_lottie = st.columns([2, 1])
+    with col_upload_form:
+        with st.form("document_upload_form"):
+            uploaded_file = st.file_uploader("Choose a document to upload", type=UPLOAD_EXTENSIONS, help="Supported formats: PDF, DOCX, JPG, PNG, TXT, XLSX")
+            document_title = st.text_input("Document Title (Optional)", placeholder="e.g., Q4 Financial Report, Metro Line 3 Design")
+            document_type = st.selectbox("Document Type", DOCUMENT_TYPES, index=0)
+            submit_button = st.form_submit_button("Upload Document & Process")
+
+            if submit_button:
+                if uploaded_file is not None:
+                    try:
+                        job_id = get_services().submit_upload(uploaded_file, uploaded_file.name,
+                                                              document_title, document_type)
+                    except QueueFull:
+                        st.warning("The processing queue is full right now. Please try again in a minute.")
+                    else:
+                        st.session_state.setdefault("upload_jobs", []).append(job_id)
+                        st.success(f"✅ Document '{uploaded_file.name}' uploaded successfully!")
+                        st.write("Processing has started in the background; progress is shown below.")
+                else:
+                    st.error("Please select a file to upload.")
+
+        render_upload_jobs()
+
+    with col_upload_lottie:
+        upload_lottie = load_lottie("upload")
+        if upload_lottie:
+            st_lottie(upload_lottie, height=300, key="upload_animation")
+        st.markdown("---")
+        st.markdown("#### How it Works:")
+        st.write("""
+        1. **Upload:** Your file is securely transmitted.
+        2. **OCR:** If it's an image/scanned PDF, text is extracted.
+        3. **NLP:** Content is analyzed, summarized, and keywords are identified.
+        4. **Indexing:** The document and its metadata are stored in ElasticSearch for rapid retrieval.
+        """)
+
+    with st.expander("🛠️ Functions and Technologies on Upload Page"):
+        st.write("""
+        - **File Uploader (`st.file_uploader`):** Handles secure file uploads from the user interface.
+        - **Forms (`st.form`):** Organizes user input fields for metadata (title, type) and streamlines submission.
+        - **Backend Integration (Simulated):** In a real application, the `submit_button` would trigger an API call to a **Flask/Django** backend.
+        - **OCR & NLP (Backend):** The backend would then initiate **OCR (e.g., Tesseract, Google Cloud Vision)** for scanned documents and **NLP (SpaCy, Hugging Face)** for summarization and entity extraction.
+        - **Database & ElasticSearch (Backend):** The processed data would be stored in **PostgreSQL/MongoDB** and indexed in **ElasticSearch** for search functionality.
+        - **Streamlit Spinners (`st.spinner`):** Provides visual feedback during backend processing.
+        """)
+
+
+def session_upload_jobs():
+    pipeline = get_services().pipeline
+    return [job for job in map(pipeline.job, st.session_state.get("upload_jobs", [])) if job is not None]
+
+
+def render_upload_jobs():
+    jobs = session_upload_jobs()
+    if any(not job.finished for job in jobs):
+        poll_upload_jobs()
+    elif jobs:
+        render_job_list(jobs)
+
+
+@st.fragment(run_every=1.0)
+def poll_upload_jobs():
+    # Only this fragment reruns while jobs are in flight, not the whole script.
+    jobs = session_upload_jobs()
+    render_job_list(jobs)
+    if all(job.finished for job in jobs):
+        st.rerun()  # full rerun once, which stops the polling
+
+
+def render_job_list(jobs):
+    st.markdown("#### Processing Status")
+    for job in reversed(jobs):
+        if job.status == "failed":
+            st.error(f"**{job.label}** failed during {job.current_stage}: {job.error}")
+        elif job.finished:
+            st.success(f"**{job.label}** processed and indexed as {job.result.get('doc_id')}.")
+            st.markdown(f"**Title:** {job.result.get('title')}  |  **Type:** {job.result.get('doc_type')}")
+            if job.result.get("exact_duplicate_of"):
+                st.warning(f"Exact duplicate of {job.result['exact_duplicate_of']} (identical file content).")
+            for doc_id, jaccard in job.result.get("near_duplicates", [])[:5]:
+                st.info(f"Near-duplicate of {doc_id} (estimated {jaccard:.0%} overlap).")
+            if job.result.get("summary"):
+                st.caption(job.result["summary"])
+        else:
+            st.progress(job.progress, text=f"**{job.label}** — {job.current_stage or 'queued'}...")